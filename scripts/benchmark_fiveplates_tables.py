@@ -0,0 +1,84 @@
+"""
+Benchmark of the fast five_plates table reader (io.read_fp_table) against
+astropy's ascii readers, per five_plates file type.
+Checks that both give the same columns and values for every file.
+
+usage: python benchmark_fiveplates_tables.py [platerun]   (default: all)
+"""
+from ppv.data import io
+from ppv.util import paths
+from ppv import fiveplates
+from astropy.table import Table
+from zipfile import ZipFile
+import numpy as np
+import os
+import sys
+import time
+
+plateruns = sys.argv[1:] or fiveplates.available_plateruns()
+
+
+def file_sources(platerun):
+    """
+    {file type: (list of sources, astropy format, read_fp_table header)}
+    sources are paths or (zip path, member) pairs.
+    """
+    pdata = fiveplates.platedata(platerun)
+    dparams = io.load_fp_defaultparams(platerun)
+    version = dparams.loc['carton_list_version']['Value']
+    sources = {
+        'plate_data': ([paths.fp_platedata(platerun)],
+                       'ascii.commented_header', 'commented'),
+        'default_parameters': ([paths.fp_defaultparams(platerun)],
+                               'ascii.commented_header', 'commented'),
+        'cartons_list': ([paths.fiveplates_cartons(platerun, version)],
+                         'ascii', 'basic'),
+        'order': ([paths.fiveplates_priority(platerun, mode) for mode
+                   in sorted(set(pdata['fiberfilling']))],
+                  'ascii.no_header', None),
+    }
+    targetlists = paths.fiveplates_targetlists(platerun)
+    with ZipFile(os.fspath(targetlists)) as tl_zip:
+        members = [name for name in tl_zip.namelist()
+                   if os.path.basename(name).startswith('targetlist_')]
+    sources['targetlists'] = ([(targetlists, name) for name in members],
+                              'ascii.commented_header', 'commented')
+    designfiles = paths.fiveplates_designfiles(platerun)
+    if designfiles.exists():
+        with ZipFile(os.fspath(designfiles)) as df_zip:
+            members = df_zip.namelist()
+        sources['targets'] = ([(designfiles, name) for name in members],
+                              'ascii.commented_header', 'commented')
+    return sources
+
+
+def read_all(sources, reader):
+    tables = []
+    for source in sources:
+        if isinstance(source, tuple):
+            with io.zipfiles.open(source[0]) as zip_:
+                with zip_.open(source[1], 'r') as member:
+                    tables.append(reader(member))
+        else:
+            tables.append(reader(os.fspath(source)))
+    return tables
+
+
+for platerun in plateruns:
+    print(f'platerun {platerun}')
+    for file_type, (sources, fmt, header) in file_sources(platerun).items():
+        start = time.perf_counter()
+        astropy_tables = read_all(sources, lambda f: Table.read(f, format=fmt))
+        astropy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        fast_tables = read_all(sources, lambda f: io.read_fp_table(f, header=header))
+        fast_time = time.perf_counter() - start
+        print(f'  {file_type:20s} {len(sources):5d} files  astropy: {astropy_time:7.3f} s'
+              f'  fast: {fast_time:7.3f} s  speedup: {astropy_time / fast_time:6.1f}x')
+        for source, astropy_table, fast_table in zip(sources, astropy_tables,
+                                                     fast_tables):
+            assert astropy_table.colnames == fast_table.colnames, source
+            for column in astropy_table.colnames:
+                assert np.all(astropy_table[column] == fast_table[column]), \
+                    (source, column)
+print('Tables are identical.')
@@ -0,0 +1,50 @@
+"""
+Benchmark of the fast plugHoles reader (plate.load_plugholes) against
+the pydl yanny path (plate.load_yanny + plate.dict_to_table), and of
+loading from the binary sidecars in cache_dir (read into memory, as
+Plate does; the first pass makes any missing sidecars).
+Checks that all give the same table for every plate.
+
+Measures the first N_plates plates of the platePlans summary (ppv.plateid),
+read from the plate_dir in ppv_setup.ini; real plates unless plate_dir
+points at test data. Missing plugHoles files are rsync-ed first.
+
+usage: python benchmark_plugholes.py [N_plates]   (default 300)
+"""
+from ppv import ppv, plate
+from astropy.table import Table
+import numpy as np
+import sys
+import time
+
+N_plates = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+platenums = ppv.plateid[:N_plates]
+print(f'Reading {len(platenums)} plugHoles files')
+
+start = time.perf_counter()
+pydl_tables = [plate.dict_to_table(plate.yanny_to_dict(plate.load_yanny(platenum)))
+               for platenum in platenums]
+pydl_time = time.perf_counter() - start
+print(f'pydl yanny:  {pydl_time:8.3f} s  ({1e3 * pydl_time / len(platenums):.2f} ms per plate)')
+
+start = time.perf_counter()
+fast_tables = [Table(plate.load_plugholes(platenum, use_cache=False)[1])
+               for platenum in platenums]
+fast_time = time.perf_counter() - start
+print(f'fast reader: {fast_time:8.3f} s  ({1e3 * fast_time / len(platenums):.2f} ms per plate)')
+print(f'speedup:     {pydl_time / fast_time:8.1f}x')
+
+for platenum in platenums:  # make sure all sidecars exist
+    plate.load_plugholes(platenum)
+start = time.perf_counter()
+cached_tables = [Table(plate.load_plugholes(platenum)[1]) for platenum in platenums]
+cached_time = time.perf_counter() - start
+print(f'sidecars:    {cached_time:8.3f} s  ({1e3 * cached_time / len(platenums):.2f} ms per plate)')
+print(f'speedup:     {pydl_time / cached_time:8.1f}x')
+
+for platenum, pydl_table, fast_table, cached_table in zip(platenums, pydl_tables,
+                                                          fast_tables, cached_tables):
+    for field in plate.fields:
+        assert np.all(pydl_table[field] == fast_table[field]), (platenum, field)
+        assert np.all(pydl_table[field] == cached_table[field]), (platenum, field)
+print('Tables are identical.')
@@ -0,0 +1,67 @@
+"""
+Benchmark of the array based process.simulate_platedesign against the
+previous group_by implementation (reproduced below), on every field of
+full fiveplates plateruns. Checks that both assign the same targets.
+
+usage: python benchmark_simulate_platedesign.py [platerun ...]   (default: all)
+"""
+from ppv import fiveplates, process
+from astropy.table import vstack
+from numpy.random import Generator, PCG64
+import numpy as np
+import sys
+import time
+
+
+def simulate_platedesign_groupby(fp_targets, nSCI_apogee, nSCI_boss):
+    RandomState = Generator(PCG64(1050))
+    bypriority = fp_targets.group_by('order_priority')
+    assigned_targets = []
+    nSCI_goal = {'apogee': nSCI_apogee, 'boss': nSCI_boss}
+    nSCI_assigned = {'apogee': 0, 'boss': 0}
+    nSCI_needed = {}
+    for target_grp in bypriority.groups:
+        nSCI_needed['apogee'] = nSCI_goal['apogee'] - nSCI_assigned['apogee']
+        nSCI_needed['boss'] = nSCI_goal['boss'] - nSCI_assigned['boss']
+        instrument_ = set(target_grp['instrument']).pop()
+        Nrows = len(target_grp)
+        if set(target_grp['Type']).pop() != 0:
+            continue
+        if Nrows <= nSCI_needed[instrument_]:
+            assigned_targets.append(target_grp)
+            nSCI_assigned[instrument_] += Nrows
+        elif nSCI_needed[instrument_] > 0:
+            keep_rows_indx = RandomState.choice(Nrows, nSCI_needed[instrument_],
+                                                replace=False)
+            assigned_targets.append(target_grp[keep_rows_indx])
+            nSCI_assigned[instrument_] += len(keep_rows_indx)
+    assigned = vstack(assigned_targets)
+    assigned.sort('catalogid')
+    return assigned
+
+
+plateruns = sys.argv[1:] or fiveplates.available_plateruns()
+for platerun in plateruns:
+    fields = fiveplates.Platerun(platerun).fields
+    inputs = [(field.targets, field._platedef_params['nAPOGEE_science'],
+               field._platedef_params['nBOSS_science']) for field in fields]
+    print(f'platerun {platerun}: {len(fields)} fields')
+
+    start = time.perf_counter()
+    groupby_plates = [simulate_platedesign_groupby(*args) for args in inputs]
+    groupby_time = time.perf_counter() - start
+    start = time.perf_counter()
+    indices = [process.platedesign_indices(*args) for args in inputs]
+    indices_time = time.perf_counter() - start
+    start = time.perf_counter()
+    plates = [process.simulate_platedesign(*args) for args in inputs]
+    table_time = time.perf_counter() - start
+    print(f'  group_by:            {groupby_time:8.3f} s')
+    print(f'  platedesign_indices: {indices_time:8.3f} s  speedup: {groupby_time / indices_time:6.1f}x')
+    print(f'  simulate_platedesign:{table_time:8.3f} s  speedup: {groupby_time / table_time:6.1f}x')
+
+    for groupby_plate, plate in zip(groupby_plates, plates):
+        assert len(groupby_plate) == len(plate)
+        for column in plate.colnames:
+            assert np.all(groupby_plate[column] == plate[column]), column
+print('Simulated plates are identical.')
@@ -1,18 +1,35 @@
 from .data import io as data_io
-from .util import download, paths
+from .util import download, paths, group_rows
 
 
 class Summary:
     """
     Container for important platerun summary info.
     In class so it can be updated dynamically.
+
+    The platePlans summary is loaded lazily, on first access of any
+    attribute that needs it. Importing ppv does not touch platePlans.par.
     """
 
+    # attributes set by _load, loaded on first access
+    _lazy_attributes = ('_allplate', '_names_array', '_platerun_array',
+                        '_available_plateruns', '_fieldname_rows',
+                        '_platerun_rows', '_plateid_row')
+
     def __init__(self):
         """
         Constructor
         """
-        self._load()
+        pass
+
+    def __getattr__(self, attr):
+        """
+        Only called when attr is not (yet) set. Loads the summary if needed.
+        """
+        if attr in Summary._lazy_attributes:
+            self._load()
+            return self.__dict__[attr]
+        raise AttributeError(attr)
 
     def __str__(self):
         first = f'Information container for ppv'
@@ -35,6 +52,11 @@ class Summary:
         self._names_array = allplate['name'].astype('U')  # for quick checking
         self._platerun_array = allplate['platerun'].astype('U')  # for quick checking
         self._available_plateruns = list(set(self._platerun_array))
+        # hash indices, for quick lookups without scanning the whole summary
+        self._fieldname_rows = group_rows(self._names_array)  # name: rows
+        self._platerun_rows = group_rows(self._platerun_array)  # platerun: rows
+        self._plateid_row = {plateid: row for row, plateid in
+                             enumerate(allplate['plateid'].astype('int'))}
         return None
 
     @property
@@ -42,7 +64,7 @@ class Summary:
         try:
             return self._allplate
         except AttributeError:
-            self.load()
+            self._load()
             return self._allplate
 
     @property
@@ -53,7 +75,7 @@ class Summary:
         try:
             return self._names_array
         except AttributeError:
-            self.load()
+            self._load()
             return self._names_array
 
     def available_plateruns(self):
@@ -64,7 +86,7 @@ class Summary:
         try:
             return self._available_plateruns
         except AttributeError:
-            self.load()
+            self._load()
             return self._available_plateruns
 
     @property
@@ -75,9 +97,15 @@ class Summary:
         try:
             return self._allplate['plateid'].astype('int')  # for quick checking
         except AttributeError:
-            self.load()
+            self._load()
             return self._allplate['plateid'].astype('int')  # for quick checking
 
+    def plate_summary(self, plateid):
+        """
+        Row of the platerun summary for plate ID number plateid.
+        """
+        return self.allplate_summary[self._plateid_row[plateid]]
+
     @property
     def plate_batches(self):
         """
@@ -117,6 +145,11 @@ class Summary:
             download._run_rsync(rsync_cmd, utah_passwd)
 
         del utah_passwd  #  better to delete any reference to passwd
+
+        # add new/changed plugHoles files to the archive, if one was built
+        from . import archive  # imported here, needs the full ppv package
+        if archive.PlugHolesArchive().exists():
+            archive.update_archive()
         print('Update complete!\n')
         print(f'Latest versions now available for platePlans.par and plugHoles files for batches:\n')
         print(f'{*self.plate_batches,} plate batches')
@@ -124,4 +157,16 @@ class Summary:
 
 
 ppv = Summary()
+
+
+def lookup(catalogids):
+    """
+    Finds every plate hole of catalogids (one or millions) in one call,
+    using the inverted catalogid index of the plugHoles archive.
+    Returns a table with catalogid, plate, field, designid, platerun,
+    holetype and targettype. See archive.PlugHolesArchive.lookup.
+    """
+    from . import archive  # imported here, needs the full ppv package
+    return archive.lookup(catalogids)
+
 _fp_available = set(data_io.load_fp_description()['OriginalName'])
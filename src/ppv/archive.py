@@ -0,0 +1,345 @@
+"""
+Consolidated, memory-mapped columnar archive of the plugHoles data of
+all SDSS-V plates.
+
+Every drilled hole of every plate is one row. Each column (the plate.fields
+columns plus 'plate', 'designid' and 'platerun') is a separate .npy file in
+paths.plugholes_archive(), memory-mapped on load. The rows of a plate are
+contiguous and sorted by catalogid, so a plate (or a run of plates) is a
+zero-copy slice. An index file records the row offset and count of each plate
+and the mtime and size of its plugHoles file, so updates only parse new or
+changed plugHoles files.
+
+The archive also holds an inverted index on catalogid (the archive rows in
+catalogid order), so lookup() finds every hole of many catalogids at once.
+
+PlugHolesArchive:
+
+lookup: where were these catalogids drilled?
+
+"""
+from . import ppv
+from . import plate
+from .util import paths
+from astropy.table import Table
+import numpy as np
+import os
+import shutil
+
+
+_extra_columns = ['plate', 'designid', 'platerun']
+columns = plate.fields + _extra_columns
+
+_index_file = 'plates.npy'
+# inverted index: archive rows in catalogid order, and the sorted catalogids
+_catalogid_order_file = 'catalogid_order.npy'
+_catalogid_sorted_file = 'catalogid_sorted.npy'
+
+
+def _signature(platenum):
+    stat = paths.plateholes(platenum).stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _plate_columns(platenum, header, holes):
+    """
+    Columns of one plate, sorted by catalogid, with the extra archive columns.
+    """
+    order = np.argsort(holes['catalogid'], kind='stable')
+    N_rows = len(holes)
+    plate_columns = {field: holes[field][order] for field in plate.fields}
+    plate_columns['plate'] = np.full(N_rows, platenum, dtype=np.int64)
+    plate_columns['designid'] = np.full(N_rows, int(header['designid']),
+                                        dtype=np.int64)
+    plate_columns['platerun'] = np.full(N_rows, header['platerun'])
+    return plate_columns
+
+
+class PlugHolesArchive:
+    """
+    Interface to the columnar archive of all plugHoles data.
+    """
+
+    def __init__(self, archive_dir=None):
+        """
+
+        Parameters
+        ----------
+        archive_dir : path
+            directory of the archive. Default is paths.plugholes_archive()
+        """
+        if archive_dir is None:
+            archive_dir = paths.plugholes_archive()
+        self.archive_dir = archive_dir
+        self._load()
+
+    def __repr__(self):
+        return f'PlugHolesArchive({os.fspath(self.archive_dir)!r})'
+
+    def __str__(self):
+        return f'PlugHolesArchive: {len(self.index)} plates, {len(self)} holes'
+
+    def __len__(self):
+        return int(self.index['count'].sum())
+
+    def exists(self):
+        return (self.archive_dir / _index_file).exists()
+
+    def _load(self):
+        """
+        Memory-maps all columns of the archive. Empty if not built yet.
+        """
+        self._columns = {}
+        if self.exists():
+            self.index = np.load(os.fspath(self.archive_dir / _index_file))
+            for column in columns:
+                column_file = self.archive_dir / f'{column}.npy'
+                self._columns[column] = np.load(os.fspath(column_file),
+                                                mmap_mode='r')
+            try:
+                self._catalogid_order = np.load(
+                    os.fspath(self.archive_dir / _catalogid_order_file),
+                    mmap_mode='r')
+                self._catalogid_sorted = np.load(
+                    os.fspath(self.archive_dir / _catalogid_sorted_file),
+                    mmap_mode='r')
+            except FileNotFoundError:  # archive from before the inverted index
+                catalogids = self._columns['catalogid']
+                self._catalogid_order = np.argsort(catalogids, kind='stable')
+                self._catalogid_sorted = catalogids[self._catalogid_order]
+        else:
+            self.index = np.zeros(0, dtype=[('plate', np.int64),
+                                            ('offset', np.int64),
+                                            ('count', np.int64),
+                                            ('mtime_ns', np.int64),
+                                            ('size', np.int64)])
+        self._plate_rows = {platenum: i for i, platenum
+                            in enumerate(self.index['plate'])}
+        return None
+
+    @property
+    def platenums(self):
+        """
+        All plate numbers in the archive.
+        """
+        return self.index['plate']
+
+    def _slice(self, platenum):
+        row = self.index[self._plate_rows[platenum]]
+        return slice(row['offset'], row['offset'] + row['count'])
+
+    def plate_table(self, platenum, columns=columns):
+        """
+        Table of plugHoles data of platenum, sorted by catalogid; all
+        archive columns or only columns.
+        The columns are zero-copy (read-only) views of the archive.
+        """
+        rows = self._slice(platenum)
+        return Table([self._columns[column][rows] for column in columns],
+                     names=columns, copy=False)
+
+    def table(self, platenums=None, platerun=None):
+        """
+        Table of plugHoles data of many plates; all plates of platerun, OR
+        platenums, OR the whole archive if neither is given.
+        """
+        if platenums is None and platerun is None:
+            return Table([self._columns[column] for column in columns],
+                         names=columns, copy=False)
+        if platerun is not None:
+            platenums = np.unique(self._columns['plate'][
+                self._columns['platerun'] == platerun])
+        slices = [self._slice(platenum) for platenum in platenums]
+        rows = np.concatenate([np.arange(rows_.start, rows_.stop)
+                               for rows_ in slices])
+        return Table([self._columns[column][rows] for column in columns],
+                     names=columns, copy=False)
+
+    def lookup(self, catalogids):
+        """
+        Finds every hole of every catalogid in catalogids, using the
+        inverted index. No Plate objects are made, no plugHoles files read.
+
+        Parameters
+        ----------
+        catalogids : int or array-like
+            one or (millions of) catalogIDs
+
+        Returns
+        -------
+        astropy table with one row per hole: catalogid, plate, field,
+        designid, platerun, holetype, targettype. catalogids that were never
+        drilled have no rows. Rows are in the order of catalogids.
+        """
+        catalog_dtype = self._columns['catalogid'].dtype
+        catalogids = np.atleast_1d(np.asarray(catalogids)).astype(catalog_dtype)
+        first = np.searchsorted(self._catalogid_sorted, catalogids, side='left')
+        last = np.searchsorted(self._catalogid_sorted, catalogids, side='right')
+        N_holes = last - first
+        # positions first, first+1, ..., last-1 for each catalogid, vectorized
+        query = np.repeat(np.arange(len(catalogids)), N_holes)
+        starts = np.repeat(first - (np.cumsum(N_holes) - N_holes), N_holes)
+        rows = self._catalogid_order[starts + np.arange(N_holes.sum())]
+
+        found = Table()
+        found['catalogid'] = catalogids[query]
+        found['plate'] = self._columns['plate'][rows]
+        found['field'] = _fieldnames(found['plate'])
+        for column in ['designid', 'platerun', 'holetype', 'targettype']:
+            found[column] = self._columns[column][rows]
+        return found
+
+    def is_fresh(self, platenum):
+        """
+        Whether platenum is in the archive and its plugHoles file did not
+        change since.
+        """
+        try:
+            row = self.index[self._plate_rows[platenum]]
+            return (row['mtime_ns'], row['size']) == _signature(platenum)
+        except (KeyError, FileNotFoundError):  # new, or needs rsync
+            return False
+
+    def _stale(self, platenums):
+        """
+        plates in platenums that are not in the archive or have changed.
+        """
+        return [platenum for platenum in platenums
+                if not self.is_fresh(platenum)]
+
+    def update(self, platenums, workers=1):
+        """
+        Adds platenums to the archive. Only plugHoles files that are new or
+        changed since the last update are parsed (see plate.load_plugholes_many).
+        Plates already in the archive but not in platenums are kept.
+
+        Parameters
+        ----------
+        platenums : list of int
+            Numbers of plates; e.g., ppv.ppv.plateid
+        workers : int
+            Number of worker processes used to parse plugHoles files.
+        """
+        platenums = [int(platenum) for platenum in platenums]
+        stale = self._stale(platenums)
+        if len(stale) == 0:
+            return None
+        print(f'Adding {len(stale)} plates to the plugHoles archive.')
+        parsed = dict(zip(stale, plate.load_plugholes_many(stale, workers=workers)))
+
+        all_platenums = sorted(set(self.platenums.tolist()) | set(platenums))
+        pieces = {column: [] for column in columns}
+        index = np.zeros(len(all_platenums), dtype=self.index.dtype)
+        offset = 0
+        for i, platenum in enumerate(all_platenums):
+            if platenum in parsed:
+                plate_columns = _plate_columns(platenum, *parsed[platenum])
+                signature = _signature(platenum)
+            else:  # unchanged, copy from current archive
+                rows = self._slice(platenum)
+                plate_columns = {column: self._columns[column][rows]
+                                 for column in columns}
+                row = self.index[self._plate_rows[platenum]]
+                signature = (row['mtime_ns'], row['size'])
+            for column in columns:
+                pieces[column].append(plate_columns[column])
+            count = len(plate_columns['plate'])
+            index[i] = (platenum, offset, count) + signature
+            offset += count
+        self._write(index, {column: np.concatenate(pieces[column])
+                            for column in columns})
+        self._load()
+        return None
+
+    def _write(self, index, all_columns):
+        """
+        Writes a new archive next to the current one, then swaps them.
+        Memory-maps of the old archive stay valid until released.
+        """
+        new_dir = self.archive_dir.with_name(self.archive_dir.name + '.new')
+        old_dir = self.archive_dir.with_name(self.archive_dir.name + '.old')
+        shutil.rmtree(os.fspath(new_dir), ignore_errors=True)
+        os.makedirs(os.fspath(new_dir))
+        for column, data in all_columns.items():
+            np.save(os.fspath(new_dir / f'{column}.npy'), data)
+        catalogid_order = np.argsort(all_columns['catalogid'], kind='stable')
+        np.save(os.fspath(new_dir / _catalogid_order_file), catalogid_order)
+        np.save(os.fspath(new_dir / _catalogid_sorted_file),
+                all_columns['catalogid'][catalogid_order])
+        np.save(os.fspath(new_dir / _index_file), index)
+        if self.archive_dir.exists():
+            shutil.rmtree(os.fspath(old_dir), ignore_errors=True)
+            os.replace(os.fspath(self.archive_dir), os.fspath(old_dir))
+        os.replace(os.fspath(new_dir), os.fspath(self.archive_dir))
+        shutil.rmtree(os.fspath(old_dir), ignore_errors=True)
+        return None
+
+
+def _fieldnames(platenums):
+    """
+    Field names of platenums, from the platerun summary.
+    """
+    plates, inverse = np.unique(np.asarray(platenums), return_inverse=True)
+    names = np.array([ppv.fieldnames[ppv._plateid_row[platenum]]
+                      for platenum in plates], dtype=ppv.fieldnames.dtype)
+    return names[inverse]
+
+
+def _index_signature(archive_dir):
+    """
+    Identifies the index file of the archive in archive_dir; it changes
+    whenever the archive is rewritten (see PlugHolesArchive._write).
+    None if there is no archive.
+    """
+    try:
+        stat = (archive_dir / _index_file).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+_archive = None   # default archive, see lookup
+_archive_signature = None
+
+
+def default_archive():
+    """
+    The default archive (in paths.plugholes_archive()), None if it was not
+    built. It is loaded once and again only if it was updated since it was
+    last used. Also used by plate.Plate for archive-backed targets.
+    """
+    global _archive, _archive_signature
+    archive_dir = paths.plugholes_archive()
+    signature = _index_signature(archive_dir)
+    if signature is None:
+        return None
+    if (_archive is None or _archive.archive_dir != archive_dir or
+            signature != _archive_signature):
+        _archive = PlugHolesArchive(archive_dir)
+        _archive_signature = signature
+    return _archive
+
+
+def lookup(catalogids):
+    """
+    Where were catalogids drilled? See PlugHolesArchive.lookup.
+    Uses the default archive, which is built the first time if needed
+    (this parses all plugHoles files once).
+    """
+    archive = default_archive()
+    if archive is None:
+        print('Building plugHoles archive (one time only). Please be patient.')
+        update_archive()
+        archive = default_archive()
+    return archive.lookup(catalogids)
+
+
+def update_archive(workers=1):
+    """
+    Builds or updates the default archive with all plates in ppv.ppv.
+    """
+    global _archive
+    archive = PlugHolesArchive()
+    archive.update(ppv.plateid, workers=workers)
+    _archive = None  # lookup loads the updated archive
+    return archive
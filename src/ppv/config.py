@@ -15,6 +15,8 @@ try:
     config.read_file(open(os.fspath(_config_path), 'r'))
     plate_dir = Path(config.get('paths', 'plate_dir', fallback=None))
     fiveplates_dir = Path(config.get('paths', 'fiveplates_dir', fallback=Path.home()))
+    cache_dir = Path(config.get('paths', 'cache_dir',
+                                fallback=os.fspath(Path.home() / '.cache' / 'ppv')))
     utah_username = config['username']['sdss_org']
 except FileNotFoundError:
     print(f'Configuration file does not exist!')
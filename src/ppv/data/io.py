@@ -3,11 +3,19 @@ functions for loading (writing?) data from disk
 """
 from ..util import paths, download
 from .. import config
-from astropy.table import Table
-from astropy.io import ascii
+from astropy.table import MaskedColumn, Table
+from astropy.io import fits
+from collections import OrderedDict
+from contextlib import contextmanager
 from zipfile import ZipFile
+import hashlib
+import json
 import os
+import re
+import threading
+import warnings
 import numpy as np
+from numpy.lib.recfunctions import repack_fields
 
 # load yanny reader and writer (this works for platePlans.par)
 # but it does not for the plugHoles files due to dtype issue.
@@ -15,13 +23,155 @@ import numpy as np
 from astropy.io.registry import (register_identifier, register_reader,
                                  register_writer)
 from pydl.pydlutils.yanny import (is_yanny, read_table_yanny,
-                                  write_table_yanny)
+                                  write_table_yanny, yanny)
 register_identifier('yanny', Table, is_yanny)
 register_reader('yanny', Table, read_table_yanny)
 register_writer('yanny', Table, write_table_yanny)
 
 # END Yanny config
 
+# Fast yanny structure reader (used for the plugHoles files)
+
+_typedef_struct = re.compile(r'typedef\s+struct\s*\{([^}]+)\}\s*(\w+)\s*;')
+_typedef_enum = re.compile(r'typedef\s+enum\s*\{[^}]+\}\s*\w+\s*;')
+# a yanny "word": quoted string, {array}, or anything up to whitespace
+_yanny_token = re.compile(r'"[^"]*"|\{[^}]*\}|[^\s"{]+')
+_double_braces = re.compile(r'\{\s*\{\s*\}\s*\}')
+_yanny_word = r'(?:"[^"]*"|\{[^}]*\}|[^\s"{]+)'  # _yanny_token, no group
+
+
+def _columns_pattern(wanted):
+    """
+    Regex matching the start of a row of yanny tokens that captures only the
+    tokens at positions wanted, and skips everything after the last of them.
+    """
+    words = [f'({_yanny_word})' if N in wanted else _yanny_word
+             for N in range(max(wanted) + 1)]
+    return re.compile(r'^[ \t]*' + r'[ \t]+'.join(words), re.MULTILINE)
+
+
+def _struct_columns(definition):
+    """
+    Column names, in order, from the body of a yanny typedef struct.
+    """
+    return [re.sub(r'[\[<].*[\]>]$', '', column) for column in
+            re.findall(r'\S+\s+(\S+);', definition)]
+
+
+def _tokens_to_array(tokens, dtype):
+    """
+    Converts a list of yanny tokens (strings) to a numpy array of dtype.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind in 'US':
+        return np.array([token.strip('"') for token in tokens], dtype=dtype)
+    if dtype.kind == 'u':  # cast like numpy does for python ints
+        return np.array(tokens, dtype=np.int64).astype(dtype)
+    return np.array(tokens, dtype=dtype)
+
+
+def read_yanny_header(file_path):
+    """
+    Reads only the keyword/value pairs at the top of a yanny parameter file,
+    stopping at the first structure definition. Cheap for files like
+    plugHoles, where all keywords come before the table.
+
+    Returns
+    -------
+    header : dict
+        keyword/value pairs. Values are strings, the same as pydl's yanny.
+    """
+    header = {}
+    with open(os.fspath(file_path), 'r') as f:
+        for line in f:
+            line = line.strip()
+            if len(line) == 0 or line.startswith('#'):
+                continue
+            if line.startswith('typedef'):
+                break
+            key, *value = re.split(r'\s+', yanny.trailing_comment(line), 1)
+            header[key] = value[0] if value else ''
+    return header
+
+
+def read_yanny_struct(file_path, structname, dtypes):
+    """
+    Reads one structure of a yanny parameter file straight into a numpy
+    structured array. Only the columns in dtypes are tokenized and converted.
+    Much faster than pydl's yanny for large tables, e.g., STRUCT1 of
+    plugHoles files, because the rows are tokenized all at once instead of
+    word by word.
+
+    Parameters
+    ----------
+    file_path : path
+        yanny parameter file
+    structname : str
+        name of the structure, e.g. 'STRUCT1'
+    dtypes : list of (str, dtype)
+        column names and dtypes to read, e.g. plate._field_dtypes.
+        Unsized string dtypes ('U') are sized to the longest value.
+
+    Returns
+    -------
+    header : dict
+        keyword/value pairs of the parameter file. Values are strings,
+        the same as pydl's yanny.
+    data : numpy structured array
+        rows of structname with the columns in dtypes.
+    """
+    with open(os.fspath(file_path), 'r') as f:
+        contents = re.sub(r'\\\s*\n', ' ', f.read())  # reattach lines ending with \
+
+    structs = {name.upper(): _struct_columns(definition) for definition, name
+               in _typedef_struct.findall(contents)}
+    columns = structs[structname.upper()]
+    contents = _typedef_enum.sub('', _typedef_struct.sub('', contents))
+
+    row_pattern = re.compile(r'^[ \t]*{}[ \t]+(.*)$'.format(structname),
+                             re.MULTILINE | re.IGNORECASE)
+    rows = row_pattern.findall(contents)
+
+    header = {}
+    for line in row_pattern.sub('', contents).split('\n'):
+        line = line.strip()
+        if len(line) == 0 or line.startswith('#'):
+            continue
+        key, *value = re.split(r'\s+', yanny.trailing_comment(line), 1)
+        if key.upper() in structs:  # rows of other structures
+            continue
+        header[key] = value[0] if value else ''
+
+    if any('#' in row for row in rows):  # rare, strip trailing comments
+        rows = [yanny.trailing_comment(row) for row in rows]
+    rows_text = _double_braces.sub('""', '\n'.join(rows))
+    N_columns = len(columns)
+    wanted = sorted(columns.index(name) for name, _ in dtypes)
+    if len(wanted) < N_columns:  # only tokenize the wanted columns
+        matches = _columns_pattern(set(wanted)).findall(rows_text)
+        if len(matches) != len(rows):
+            raise ValueError(f'{os.fspath(file_path)}: {structname} rows do not '
+                             f'all have the columns {[name for name, _ in dtypes]}.')
+        if len(wanted) == 1:
+            matches = [(match,) for match in matches]
+        column_tokens = dict(zip(wanted, zip(*matches))) if matches else \
+            {N: () for N in wanted}
+    else:
+        tokens = _yanny_token.findall(rows_text)
+        if len(tokens) != N_columns * len(rows):
+            raise ValueError(f'{os.fspath(file_path)}: {structname} rows do not '
+                             f'all have {N_columns} values.')
+        column_tokens = {N: tokens[N::N_columns] for N in wanted}
+
+    arrays = [_tokens_to_array(list(column_tokens[columns.index(name)]), dtype)
+              for name, dtype in dtypes]
+    data = np.empty(len(rows), dtype=[(name, array.dtype) for (name, _), array
+                                      in zip(dtypes, arrays)])
+    for (name, _), array in zip(dtypes, arrays):
+        data[name] = array
+    return header, data
+
+
 
 def _parse_plate_plans():
     """
@@ -38,6 +188,8 @@ def _parse_plate_plans():
     is_sdss5_plate = np.bitwise_or(is_mwm_plate, is_bhm_plate)
 
     sdss5_plates = platePlans[is_sdss5_plate]
+    # record which platePlans.par this was made from (see _plansummary_is_stale)
+    sdss5_plates.meta.update(_plateplans_par_signature())
     out_filename = paths.plate_plans()
     # delete the file if it exists
     if out_filename.exists():
@@ -47,6 +199,151 @@ def _parse_plate_plans():
     return None
 
 
+def _sidecar_signature(file_path):
+    stat = os.stat(os.fspath(file_path))
+    return {'source': os.fspath(file_path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size}
+
+
+def load_sidecar(file_path, sidecar_path, names, columns=None):
+    """
+    Loads binary sidecar of a parsed file. It is read into memory, not
+    memory-mapped, so no file stays open per loaded plate. With columns,
+    the sidecar is memory-mapped only while those columns are copied out,
+    so only they are allocated.
+
+    Parameters
+    ----------
+    file_path : path
+        source file the sidecar was made from
+    sidecar_path : path
+        .npy file; the header is in the .json file next to it
+    names : list of str
+        column names the structured array must have
+    columns : list of str
+        if given, only these columns (of names) are returned
+
+    Returns
+    -------
+    header : dict, data : numpy structured array
+        OR None if the sidecar does not exist or is stale; i.e., the mtime
+        or size of file_path changed or the columns differ. A sidecar that
+        cannot be read is also None, with a warning.
+    """
+    meta = _sidecar_meta(file_path, sidecar_path)
+    if meta is None:
+        return None
+    try:
+        data = np.load(os.fspath(sidecar_path),
+                       mmap_mode=None if columns is None else 'r')
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as error:  # corrupt, or e.g. out of file handles
+        warnings.warn(f'Unable to read sidecar {os.fspath(sidecar_path)}: {error}')
+        return None
+    if data.dtype.names != tuple(names):
+        return None
+    if columns is not None:  # packed copy, releases the memory-map
+        data = repack_fields(np.array(data[list(columns)]))
+    return meta['header'], data
+
+
+def _sidecar_meta(file_path, sidecar_path):
+    """
+    Contents of the .json file of sidecar_path. None if missing or stale.
+    """
+    json_path = sidecar_path.with_suffix('.json')
+    try:
+        with open(os.fspath(json_path), 'r') as f:
+            meta = json.load(f)
+        if meta['signature'] != _sidecar_signature(file_path):
+            return None
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError):  # corrupt, remade on the next write
+        return None
+    except OSError as error:
+        warnings.warn(f'Unable to read sidecar {os.fspath(json_path)}: {error}')
+        return None
+    return meta
+
+
+def load_sidecar_header(file_path, sidecar_path):
+    """
+    Only the header saved with a sidecar (see load_sidecar). None if stale.
+    """
+    meta = _sidecar_meta(file_path, sidecar_path)
+    if meta is None:
+        return None
+    return meta['header']
+
+
+def write_sidecar(file_path, sidecar_path, header, data):
+    """
+    Writes structured array data to sidecar_path (.npy) and header,
+    along with the mtime and size of file_path, to a .json file next to it.
+    Failing to write (e.g., read-only cache_dir) is not an error, but warns.
+    """
+    json_path = sidecar_path.with_suffix('.json')
+    meta = {'signature': _sidecar_signature(file_path), 'header': header}
+    try:
+        os.makedirs(os.fspath(sidecar_path.parent), exist_ok=True)
+        # write to temporary files first, readers never see partial files
+        npy_tmp = sidecar_path.with_suffix(f'.{os.getpid()}.npy')
+        np.save(os.fspath(npy_tmp), data)
+        os.replace(os.fspath(npy_tmp), os.fspath(sidecar_path))
+        json_tmp = json_path.with_suffix(f'.{os.getpid()}.json')
+        with open(os.fspath(json_tmp), 'w') as f:
+            json.dump(meta, f)
+        os.replace(os.fspath(json_tmp), os.fspath(json_path))
+    except OSError as error:
+        warnings.warn(f'Unable to write sidecar {os.fspath(sidecar_path)}: {error}')
+    return None
+
+
+def _file_digest(file_path, chunk_size=2**20):
+    """
+    sha1 hexdigest of the contents of file_path, read in chunks.
+    """
+    digest = hashlib.sha1()
+    with open(os.fspath(file_path), 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _plateplans_par_signature():
+    """
+    mtime and hash of platePlans.par as FITS header keywords.
+    Stored in platePlans_sdss5.fits so staleness can be checked cheaply.
+    """
+    par_file = paths.platePlans_par()
+    return {'PARMTIME': par_file.stat().st_mtime_ns,
+            'PARSHA1': _file_digest(par_file)}
+
+
+def _plansummary_is_stale():
+    """
+    Checks if platePlans_sdss5.fits needs to be regenerated from platePlans.par.
+    The mtime of platePlans.par is checked first; the (slower) hash is only
+    computed when the mtime has changed, e.g., a fresh rsync of the same file.
+    """
+    par_file = paths.platePlans_par()
+    if not par_file.exists():  # nothing to regenerate from
+        return False
+    header = fits.getheader(os.fspath(paths.plate_plans()), 1)
+    par_mtime = par_file.stat().st_mtime_ns
+    if header.get('PARMTIME') == par_mtime:
+        return False
+    if header.get('PARSHA1') == _file_digest(par_file):
+        # same contents, just touched. Record new mtime to skip hashing next time
+        fits.setval(os.fspath(paths.plate_plans()), 'PARMTIME',
+                    value=par_mtime, ext=1)
+        return False
+    return True
+
+
 def load_plansummary():
     if not paths.plate_plans().exists():  # Need to download
         try:
@@ -56,19 +353,143 @@ def load_plansummary():
             print(f'An error occurred. {os.fspath(paths.plate_plans())} does not exist\n')
             print(f'AND an error occured when trying to execute either\n')
             print(f'util.download.plate_plans OR _parse_plate_plans\n')
-    else:
-        _parse_plate_plans()  # already there, parse it
+    elif _plansummary_is_stale():  # platePlans.par changed, parse it again
+        _parse_plate_plans()
     return Table.read(os.fspath(paths.plate_plans()), format='fits')
 
 
+def _check_for_cache_dir():
+    # exist_ok, many processes may create it at once
+    os.makedirs(config.cache_dir, exist_ok=True)
+    return None
+
+
+# Fast reader for the five_plates ASCII tables: whitespace separated columns,
+# with a '#' commented header line (header='commented'), a plain header line
+# (header='basic') or no header (header=None; columns col1, col2, ...).
+# Columns in _fp_schema are converted straight to their dtype; the others
+# are tried as int, then float, then str, like astropy does, without astropy's
+# guessing of the table format.
+
+_fp_schema = {
+    # targetlists and targets files
+    'Catalog_id': np.int64,
+    'RA': np.float64,
+    'Dec': np.float64,
+    'carton': str,
+    # plate_data
+    'fieldname': str,
+    'plateid': np.int64,
+    'designid': np.int64,
+    'locationid': np.int64,
+    'raCen': np.float64,
+    'decCen': np.float64,
+    'radius': np.float64,
+    'fiberfilling': str,
+    'platerun': str,
+    # default_parameters
+    'Parameter': str,
+    'Value': str,
+    # cartons_list
+    'program': str,
+    'category': str,
+}
+
+_quoted_token = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _split_row(line):
+    if '"' in line:
+        return [quoted or word for quoted, word in _quoted_token.findall(line)]
+    return line.split()
+
+
+def _typed_column(values, dtype=None):
+    """
+    values (numpy str array) converted to dtype from the schema, else int, float
+    or str, whichever is the first to work for all values.
+    Empty values (quoted "" fields) are masked, as astropy does.
+    A column without rows gets dtype from the schema, else int.
+    """
+    if len(values) == 0:
+        return np.zeros(0, dtype='U1' if dtype is str else dtype or np.int64)
+    empty = values == ''
+    if empty.any():
+        typed = _typed_column(values[~empty], dtype)
+        data = np.zeros(len(values), dtype=typed.dtype)
+        data[~empty] = typed
+        return MaskedColumn(data, mask=empty)
+    if dtype is not str:
+        for dtype_ in ([dtype] if dtype else []) + [np.int64, np.float64]:
+            try:
+                return values.astype(dtype_)
+            except ValueError:
+                continue
+    width = max(1, np.char.str_len(values).max())
+    return values.astype(f'U{width}')   # as narrow as the longest value
+
+
+def read_fp_table(source, header='commented', names=None):
+    """
+    Reads a five_plates ASCII table; the fast replacement for
+    Table.read(format='ascii.commented_header' / 'ascii' / 'ascii.no_header').
+
+    Parameters
+    ----------
+    source : path or file object
+        file to read. File objects (e.g., zip members) may give bytes.
+    header : str or None
+        'commented' (header line starts with '#'), 'basic' (first
+        non-comment line) or None (no header; columns named col1, col2...)
+    names : list of str
+        column names to use instead of those in the header.
+
+    Returns
+    -------
+    astropy table
+    """
+    if hasattr(source, 'read'):
+        text = source.read()
+    else:
+        with open(os.fspath(source), 'rb') as f:
+            text = f.read()
+    if isinstance(text, bytes):
+        text = text.decode()
+    header_names = None
+    lines = []
+    for line in text.splitlines():
+        if line.lstrip().startswith('#'):
+            if header == 'commented' and header_names is None:
+                header_names = _split_row(line.lstrip()[1:])
+            continue
+        if line.strip():
+            lines.append(line)
+    if header == 'basic' and lines:
+        header_names = _split_row(lines.pop(0))
+    if header_names is None:  # no header, columns from the first row
+        N_columns = len(_split_row(lines[0])) if lines else 0
+        header_names = [f'col{N + 1}' for N in range(N_columns)]
+    N_columns = len(header_names)
+    if '"' in text:  # quoted strings, split row by row
+        tokens = [token for line in lines for token in _split_row(line)]
+    else:  # all rows at once
+        tokens = ' '.join(lines).split()
+    if len(tokens) != len(lines) * N_columns:
+        raise ValueError(f'{source}: rows do not all have {N_columns} columns')
+    tokens = np.array(tokens, dtype=str).reshape(len(lines), N_columns)
+    if names is None:
+        names = header_names
+    return Table([_typed_column(tokens[:, N], _fp_schema.get(name))
+                  for N, name in enumerate(header_names)],
+                 names=names, copy=False)
+
+
 def _load_commented_header(file_path, **table_kwds):
-    if file_path.exists():
+    if paths.fp_exists(file_path):
         pass
     else:
         raise FileNotFoundError(os.fspath(file_path))
-    return  Table.read(os.fspath(file_path),
-                       format='ascii.commented_header',
-                       **table_kwds)
+    return read_fp_table(file_path, header='commented', **table_kwds)
 
 
 def load_fp_description():
@@ -136,11 +557,11 @@ def load_fp_platedata(platerun, **table_kwds):
 
 def load_fp_defaultparams(platerun):
     params_file = paths.fp_defaultparams(platerun)
-    if params_file.exists():
+    if paths.fp_exists(params_file):
         pass
     else:
         raise FileNotFoundError(os.fspath(params_file))
-    dp_table =  Table.read(os.fspath(params_file), format='ascii.commented_header')
+    dp_table = read_fp_table(params_file, header='commented')
     dp_table.add_index('Parameter')
     return dp_table
 
@@ -148,21 +569,21 @@ def load_fiveplates_summary(platerun):
     """
     """
     summary_file = paths.fiveplates_summary(platerun)
-    if summary_file.exists():
+    if paths.fp_exists(summary_file):
         pass
     else:
         raise FileNotFoundError(os.fspath(summary_file))
-    return Table.read(os.fspath(summary_file), format='ascii')
+    return read_fp_table(summary_file, header='basic')
 
 def load_fiveplates_cartons(platerun, version):
     """
     """
     cartons_file = paths.fiveplates_cartons(platerun, version=version)
-    if cartons_file.exists():
+    if paths.fp_exists(cartons_file):
         pass
     else:
         raise FileNotFoundError(os.fspath(cartons_file))
-    cartons_table = Table.read(os.fspath(cartons_file), format='ascii')
+    cartons_table = read_fp_table(cartons_file, header='basic')
     cartons_table.add_index('carton')
     return cartons_table
 
@@ -170,12 +591,11 @@ def load_fiveplates_priority(platerun, filling_scheme):
     """
     """
     priority_file = paths.fiveplates_priority(platerun, filling_scheme)
-    if priority_file.exists():
+    if paths.fp_exists(priority_file):
         pass
     else:
         raise FileNotFoundError(os.fspath(priority_file))
-    priority_table = Table.read(os.fspath(priority_file),
-                                format='ascii.no_header')
+    priority_table = read_fp_table(priority_file, header=None)
     old_colname = priority_table.colnames[0]
     priority_indx = list(range(len(priority_table)))
     priority_table['order'] = priority_indx
@@ -183,6 +603,176 @@ def load_fiveplates_priority(platerun, filling_scheme):
     priority_table.add_index('program')
     return priority_table
 
+class _PooledZip:
+    """
+    An open ZipFile, its member names and how many readers are using it.
+    """
+    __slots__ = ('zipfile', 'members', 'users', 'evicted')
+
+    def __init__(self, zip_path):
+        self.zipfile = ZipFile(os.fspath(zip_path))
+        self.members = frozenset(self.zipfile.namelist())
+        self.users = 0
+        self.evicted = False
+
+
+class ZipFilePool:
+    """
+    Bounded, thread-safe cache of open ZipFile objects (and their member
+    listings), keyed by archive path and mtime. The five_plates zip files
+    are opened (and their central directories parsed) once, not once per
+    member read. A zip file that changed on disk gets a new handle.
+    Least recently used handles are closed when the pool is full; a handle
+    still being read is closed when its last reader is done.
+    A forked (worker) process starts with an empty pool: open files share
+    their offset with the parent, so handles cannot be shared across a fork.
+    """
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self._forget()
+        self.hits = 0
+        self.misses = 0
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self):
+        """
+        Drops all handles without closing them (they belong to the parent).
+        """
+        self._lock = threading.Lock()
+        self._pooled = OrderedDict()  # (path, mtime_ns): _PooledZip
+
+    def __len__(self):
+        return len(self._pooled)
+
+    def _evict(self, key):
+        pooled = self._pooled.pop(key)
+        pooled.evicted = True
+        if pooled.users == 0:
+            pooled.zipfile.close()
+
+    def _acquire(self, zip_path):
+        path = os.fspath(zip_path)
+        key = (path, os.stat(path).st_mtime_ns)
+        with self._lock:
+            pooled = self._pooled.get(key)
+            if pooled is None:
+                self.misses += 1
+                for old_key in [k for k in self._pooled if k[0] == path]:
+                    self._evict(old_key)  # zip file changed on disk
+                pooled = _PooledZip(path)
+                self._pooled[key] = pooled
+                while len(self._pooled) > self.maxsize:
+                    self._evict(next(iter(self._pooled)))
+            else:
+                self.hits += 1
+                self._pooled.move_to_end(key)
+            pooled.users += 1
+        return pooled
+
+    def _release(self, pooled):
+        with self._lock:
+            pooled.users -= 1
+            if pooled.evicted and pooled.users == 0:
+                pooled.zipfile.close()
+
+    @contextmanager
+    def open(self, zip_path):
+        """
+        Context manager giving the pooled ZipFile of zip_path.
+        Do not close it; it stays open for the next reader.
+        """
+        pooled = self._acquire(zip_path)
+        try:
+            yield pooled.zipfile
+        finally:
+            self._release(pooled)
+
+    def members(self, zip_path):
+        """
+        frozenset of the member names of zip_path.
+        """
+        pooled = self._acquire(zip_path)
+        self._release(pooled)
+        return pooled.members
+
+    def clear(self):
+        """
+        Closes all handles not in use (the others when their readers finish).
+        """
+        with self._lock:
+            for key in list(self._pooled):
+                self._evict(key)
+        return None
+
+
+zipfiles = ZipFilePool()   # shared by all readers of five_plates zip files
+
+
+class FileCache:
+    """
+    Bounded, thread-safe cache of tables parsed from small files (default
+    parameters, cartons lists, fiber filling orders), keyed by loader, its
+    arguments, and the path and mtime of the file. A file is parsed once
+    per process and again only when it changes (e.g., five_plates is pulled).
+    Least recently used tables are dropped when the cache is full.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._tables = OrderedDict()  # (loader, args, path, mtime_ns): table
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._tables)
+
+    def get(self, file_path, loader, *args):
+        """
+        loader(*args), which parses file_path, from the cache if file_path
+        did not change since. Raises FileNotFoundError if it does not exist.
+        """
+        path = os.fspath(file_path)
+        key = (loader.__module__, loader.__qualname__, args,
+               path, os.stat(path).st_mtime_ns)
+        with self._lock:
+            try:
+                table = self._tables[key]
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            except KeyError:
+                self.misses += 1
+        table = loader(*args)   # parse outside of the lock
+        with self._lock:
+            stale = [key_ for key_ in self._tables if key_[:4] == key[:4]]
+            for key_ in stale:  # older versions of the file
+                del self._tables[key_]
+            self._tables[key] = table
+            while len(self._tables) > self.maxsize:
+                self._tables.popitem(last=False)
+        return table
+
+    def stats(self):
+        """
+        dict of hits, misses, size and maxsize of the cache.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self), 'maxsize': self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self.hits = 0
+            self.misses = 0
+        return None
+
+
+metadata = FileCache()   # shared by fiveplates Fields, Plateruns and helpers
+
+
 def load_fiveplates_field(platerun, field, designID, type='clean'):
     """
     path to zip file containing fields_files in five_plates repo.
@@ -195,7 +785,7 @@ def load_fiveplates_field(platerun, field, designID, type='clean'):
         typically the output of paths.fiveplates_clean_field_file OR
         paths.fiveplates_field_file 
     """
-    if paths.fiveplates_designfiles(platerun).exists():
+    if paths.fp_exists(paths.fiveplates_designfiles(platerun)):
         field_zip = paths.fiveplates_designfiles(platerun)
         if type=='clean':
             field_file_str = paths.fiveplates_clean_design_file(field, designID)
@@ -207,9 +797,9 @@ def load_fiveplates_field(platerun, field, designID, type='clean'):
             field_file_str = paths.fiveplates_clean_field_file(field)
         else:
             field_file_str = paths.fiveplates_field_file(field) # 'input'
-    with ZipFile(os.fspath(field_zip)) as fp_zip:
+    with zipfiles.open(field_zip) as fp_zip:
         with fp_zip.open(field_file_str, 'r') as field:
-            data = Table.read(field, format='ascii.commented_header')
+            data = read_fp_table(field, header='commented')
     return data
 
 def is_comment(s):
@@ -221,35 +811,46 @@ def str_to_number_if_number(s):
     except ValueError:  #  it's a string
         return s
 
-def fp_platedef_params(platerun, field, designID):
-    targetlists_zip = paths.fiveplates_targetlists(platerun)
+def fp_platedef_params(platerun, field, designID, tl_zip=None):
+    """
+    Parameters of the plateDefinition file of field and designID.
+    tl_zip is the open targetlists zip of platerun, if the caller has it
+    (see fiveplates.Platerun.build_cache); otherwise it comes from zipfiles.
+    """
+    if tl_zip is None:
+        with zipfiles.open(paths.fiveplates_targetlists(platerun)) as tl_zip:
+            return fp_platedef_params(platerun, field, designID, tl_zip=tl_zip)
     params = {}
-    with ZipFile(os.fspath(targetlists_zip)) as tl_zip:
-        with tl_zip.open(paths.fiveplates_platedef(field, designID), 'r') as pldef:
-            rows = pldef.readlines()
-            for row in rows:
-                row = row.decode() # ZipFile must put this in bytes
-                items_ = row.strip().split() # split on whitespace
-                if row.startswith('#') or len(items_) < 2:
-                    continue
-                key = items_[0]
-                if len(items_) == 2:   # simple key:value pair
-                    value = str_to_number_if_number(items_[1])
-                else: # it's a list
-                    value = items_[1:]
-                    value = [str_to_number_if_number(val) for val in value]
-                params[key] = value
+    with tl_zip.open(paths.fiveplates_platedef(field, designID), 'r') as pldef:
+        rows = pldef.readlines()
+        for row in rows:
+            row = row.decode() # ZipFile must put this in bytes
+            items_ = row.strip().split() # split on whitespace
+            if row.startswith('#') or len(items_) < 2:
+                continue
+            key = items_[0]
+            if len(items_) == 2:   # simple key:value pair
+                value = str_to_number_if_number(items_[1])
+            else: # it's a list
+                value = items_[1:]
+                value = [str_to_number_if_number(val) for val in value]
+            params[key] = value
     return params
 
-def fp_plateinput(platerun, field, designID, inputfile):
+def fp_plateinput(platerun, field, designID, inputfile, tl_zip=None):
+    """
+    Table of plateInput file inputfile of field and designID, None if
+    the file does not exist. tl_zip as in fp_platedef_params.
+    """
     targetlists_zip = paths.fiveplates_targetlists(platerun)
-    try:
-        with ZipFile(os.fspath(targetlists_zip)) as tl_zip:
-            pl_input_path_str = f'{paths.fp_field_designID_dir(field, designID)}/{inputfile}'
-            with tl_zip.open(pl_input_path_str, 'r') as pl_input:
-                data = Table.read(pl_input, format='ascii.commented_header')
-    except KeyError:   # The file was not in the zip archive
+    pl_input_path_str = f'{paths.fp_field_designID_dir(field, designID)}/{inputfile}'
+    if pl_input_path_str not in zipfiles.members(targetlists_zip):
         print(f'warning: {paths.fp_field_designID_dir(field, designID)}/{inputfile} does not exist.')
         print(f'please ignore if platerun was prior to MWM_04')
         return None
+    if tl_zip is None:
+        with zipfiles.open(targetlists_zip) as tl_zip:
+            return fp_plateinput(platerun, field, designID, inputfile, tl_zip=tl_zip)
+    with tl_zip.open(pl_input_path_str, 'r') as pl_input:
+        data = read_fp_table(pl_input, header='commented')
     return data
@@ -11,17 +11,23 @@ Platerun:
 """
 from . import _fp_available
 from .data import io
-from .util import scalar_column, paths
+from .util import scalar_column, merge_sorted, paths
 from . import config
-from .process import simulate_platedesign
-from .parse_platedata import fp_plateplans
+from .process import simulate_platedesign, simulate_platedesign_ensemble
+from .parse_platedata import fp_platedata, write_cache
 import numpy as np
 from astropy import units as u
 from astropy.coordinates import SkyCoord
 from astropy.time import Time
 from astropy.table import vstack, Column, Table
 from astropy.io import ascii
+from astropy.io import fits
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import hashlib
 import os
+import re
+import warnings
 
 
 # Getting plateruns
@@ -42,13 +48,78 @@ _fp_to_prefect_name = {fp_name : prefect_name for
                        zip(_prefect_name, _available)}
 
 plateruns = list(_fp_available)
-platedata_paths = [paths.fp_platedata(prun) for prun in plateruns]
 
-_plateruns_with_platedata = [prun for prun, pd_path in zip(plateruns, platedata_paths)
-                             if pd_path is not None]
+# plate_data tables are loaded lazily, one platerun at a time, on first use.
+# _main_platedata (all plateruns, akin to platePlan.par) is only built when a
+# Field is constructed without its platerun or by calling preload().
 
-# Get main plate-data, this is akin to platePlan.par
-_main_platedata = fp_plateplans(_plateruns_with_platedata)
+_platedata = {}
+_main_platedata = None
+
+
+def platedata(platerun, save=True):
+    """
+    plate_data table for platerun with fieldname and designid indices.
+    Loaded on first call and cached. None if platerun has no plate_data file.
+    See parse_platedata.fp_platedata for save.
+    """
+    try:
+        return _platedata[platerun]
+    except KeyError:
+        pdata = fp_platedata(platerun, save=save)
+        _platedata[platerun] = pdata
+        return pdata
+
+
+def main_platedata():
+    """
+    plate_data of all plateruns in one table, akin to platePlan.par.
+    Loads plate_data for every platerun not loaded yet.
+    """
+    global _main_platedata
+    if _main_platedata is None:
+        pdata_tables = [platedata(prun, save=False) for prun in plateruns]
+        write_cache()   # once, for any plateruns that were re-parsed
+        _main_platedata = vstack([pdata for pdata in pdata_tables
+                                  if pdata is not None])
+        _main_platedata.add_index('fieldname')
+        _main_platedata.add_index('designid')
+    return _main_platedata
+
+
+# (fieldname, designid) index of plate_data tables, built once per table:
+# fieldname: [designids] and (fieldname, designid): row.
+# Five plates MAY have multiple rows in plate_data for the EXACT SAME design;
+# the index points to the first.
+
+_design_index = {}   # platerun (None for all plateruns): index
+
+
+def design_index(platerun=None):
+    """
+    dicts {fieldname: [designids]} and {(fieldname, designid): row} of the
+    plate_data of platerun, or of main_platedata() if platerun is None.
+    """
+    try:
+        return _design_index[platerun]
+    except KeyError:
+        pdata = main_platedata() if platerun is None else platedata(platerun)
+        designids, rows = {}, {}
+        for row, key in enumerate(zip(pdata['fieldname'].tolist(),
+                                      pdata['designid'].tolist())):
+            if key not in rows:
+                designids.setdefault(key[0], []).append(key[1])
+                rows[key] = row
+        _design_index[platerun] = designids, rows
+        return designids, rows
+
+
+def preload():
+    """
+    Loads plate_data for all plateruns up front instead of on first use.
+    """
+    main_platedata()
+    return None
 
 
 def replace_space(val):
@@ -109,31 +180,176 @@ def parse_instrument_name_from_file(field, designID, plate_input_filename):
     pre_ = f'targetlist_{field}_'
     return plate_input_filename.replace(pre_, '').split('_')[0]
 
-# CartonLists and defaultparameters files are per Platerun
-# Let's cache this so they are only read one time
-
-default_params = {}
-cartons = {}
+def _process_plateinput(platerun, field, designID, targetlist_filename,
+                        program_priorities, tl_zip=None):
+    targetlist_table = io.fp_plateinput(platerun, field, designID,
+                                        targetlist_filename, tl_zip=tl_zip)
+    if targetlist_table == None:
+        # NO targetlist_table exists! This is for plateruns before MWM_04
+        empty_table = Table()
+        return empty_table
+
+    priority_program_name = parse_program_name_from_file(field, designID,
+                                                         targetlist_filename)
+    instrument = parse_instrument_name_from_file(field, designID,
+                                                 targetlist_filename)
+    platerun_priority_N = program_priorities.loc[priority_program_name]['order']
+    # add ID values to table
+    Nrows = len(targetlist_table)
+    targetlist_table.add_column(scalar_column(instrument, Nrows, 'instrument'))
+    targetlist_table.add_column(scalar_column(platerun_priority_N,
+                                              Nrows, 'order_priority'))
+    targetlist_table.add_column(scalar_column(priority_program_name, Nrows,
+                                              'order_name'))
+    return targetlist_table
+
+def plateinput_table(platerun, field, designID, platedef_params,
+                     program_priorities, tl_zip=None):
+    """
+    Targets of all plateInput files of a design, sorted by catalogid, with
+    instrument, order_priority, order_name, field and designid columns.
+    Used by Field.targets and Platerun.build_cache.
 
+    Parameters
+    ----------
+    platedef_params : dictionary
+        output of io.fp_platedef_params() for field and designID
+    program_priorities : astropy table
+        fiber filling order of the design, see get_priority_table
+    tl_zip : ZipFile
+        open targetlists zip of platerun; see io.fp_platedef_params
+    """
+    _plateinput_filenames = plateInput_files(platedef_params)
+    # APOGEE standards made separately prior to MWM_04! ARRGGGHHH
+    plinput_tables = [_process_plateinput(platerun, field, designID,
+                                          targetlist_file, program_priorities,
+                                          tl_zip=tl_zip) for
+                      targetlist_file in _plateinput_filenames]
+    # if 'apogee_STA' not in targetlist_file]
+    full_table = vstack(plinput_tables)
+    full_table.rename_column('Catalog_id', 'catalogid')
+    full_table.sort('catalogid')
+    full_table.add_column(scalar_column(field, len(full_table), 'field'))
+    full_table.add_column(scalar_column(designID, len(full_table), 'designid'))
+    return full_table
+
+# CartonLists, defaultparameters and fiber filling order files are per
+# Platerun. They are cached in io.metadata (shared by Fields and Plateruns),
+# so each is only read once, or again if five_plates changes it.
 
 def get_defaultparams(platerun):
-    try:
-        return default_params[platerun]
-    except KeyError:
-        dparams = io.load_fp_defaultparams(platerun)
-        default_params[platerun] = dparams
-        return dparams
+    return io.metadata.get(paths.fp_defaultparams(platerun),
+                           io.load_fp_defaultparams, platerun)
+
+def _load_cartons_table(platerun, list_version):
+    carton_table = io.load_fiveplates_cartons(platerun, list_version)
+    carton_table['fp_program'] = get_program_names(carton_table)
+    return carton_table
 
 def get_cartons_table(platerun):
     dparams = get_defaultparams(platerun)
     list_version = dparams.loc['carton_list_version']['Value']
+    return io.metadata.get(paths.fiveplates_cartons(platerun, list_version),
+                           _load_cartons_table, platerun, list_version)
+
+def get_priority_table(platerun, filling_scheme):
+    return io.metadata.get(paths.fiveplates_priority(platerun, filling_scheme),
+                           io.load_fiveplates_priority, platerun, filling_scheme)
+
+
+# Targets of all fields of a platerun, parsed from the targetlists zip in
+# one pass by Platerun.build_cache(), are cached on disk in one FITS file per
+# platerun: a targets HDU sorted by (field, designid, catalogid) and an index
+# HDU with the row offset and count of each (field, designid).
+# Field.targets is then a slice of the cache instead of a parse of the zip.
+
+_targets_caches = {}   # platerun: (signature, targets, {(field, designid): slice})
+
+
+def _targets_cache_signature(platerun):
+    """
+    Hash of the paths and mtimes of the files the targets cache is made from:
+    targetlists zip, plate_data and fiber filling order files.
+    """
+    pdata = platedata(platerun)
+    sources = [paths.fiveplates_targetlists(platerun), paths.fp_platedata(platerun)]
+    sources += [paths.fiveplates_priority(platerun, filling_scheme) for
+                filling_scheme in sorted(set(pdata['fiberfilling']))]
+    signature = ';'.join(f'{os.fspath(source)}:{source.stat().st_mtime_ns}'
+                         for source in sources)
+    return hashlib.sha1(signature.encode()).hexdigest()
+
+
+def _write_targets_cache(platerun, field_tables):
+    """
+    Writes targets of the fields of platerun to its cache file.
+    Failing to write (e.g., unusable cache_dir) is not an error, but warns.
+
+    Parameters
+    ----------
+    field_tables : dict of (fieldname, designid): targets table
+    """
+    keys = sorted(field_tables)
+    counts = [len(field_tables[key]) for key in keys]
+    index = Table([[key[0] for key in keys], [key[1] for key in keys],
+                   np.cumsum([0] + counts[:-1]), counts],
+                  names=['field', 'designid', 'offset', 'count'])
+    targets = vstack([field_tables[key] for key in keys])
+    primary = fits.PrimaryHDU()
+    primary.header['PLATERUN'] = platerun
+    primary.header['SRCSIG'] = _targets_cache_signature(platerun)
+    cache_file = paths.fp_targets_cache(platerun)
+    # write to a temporary file first, readers never see a partial cache
+    cache_tmp = cache_file.with_suffix(f'.{os.getpid()}.fits')
     try:
-        return cartons[platerun]
+        os.makedirs(os.fspath(cache_file.parent), exist_ok=True)
+        fits.HDUList([primary, fits.table_to_hdu(targets),
+                      fits.table_to_hdu(index)]).writeto(os.fspath(cache_tmp),
+                                                         overwrite=True)
+        os.replace(os.fspath(cache_tmp), os.fspath(cache_file))
+    except OSError as error:
+        warnings.warn(f'Unable to write cache {os.fspath(cache_file)}: {error}')
+    _targets_caches.pop(platerun, None)
+    return None
+
+
+def _native(table):
+    """
+    table with its (big-endian, from FITS) columns in native byte order.
+    """
+    for colname in table.colnames:
+        column = table[colname]
+        if not column.dtype.isnative:
+            table[colname] = column.astype(column.dtype.newbyteorder('='))
+    return table
+
+
+def targets_cache(platerun):
+    """
+    Cached targets of all fields of platerun and the slice of each
+    (fieldname, designid). None if the cache was not built (see
+    Platerun.build_cache) or the five_plates files changed since.
+    """
+    cache_file = paths.fp_targets_cache(platerun)
+    if not cache_file.exists():
+        return None
+    signature = _targets_cache_signature(platerun)
+    try:
+        cached_signature, targets, slices = _targets_caches[platerun]
+        if cached_signature == signature:
+            return targets, slices
     except KeyError:
-        carton_table = io.load_fiveplates_cartons(platerun, list_version)
-        carton_table['fp_program'] = get_program_names(carton_table)
-        cartons[platerun] = carton_table
-        return carton_table
+        pass
+    with fits.open(os.fspath(cache_file)) as hdul:
+        if hdul[0].header.get('SRCSIG') != signature:
+            return None   # stale, build_cache again
+        targets = _native(Table.read(hdul[1], character_as_bytes=False))
+        index = _native(Table.read(hdul[2], character_as_bytes=False))
+    slices = {(row['field'], int(row['designid'])):
+              slice(row['offset'], row['offset'] + row['count'])
+              for row in index}
+    _targets_caches[platerun] = signature, targets, slices
+    return targets, slices
 
 
 class Field:
@@ -155,9 +371,12 @@ class Field:
     If a field has only ONE design, you need only specify the Field name.
     For fields with multiple designs (usually BHM), the design_id keyword
     must be specified.
+
+    Specifying the platerun keyword (if known) avoids loading the plate_data
+    files of every platerun.
     """
 
-    def __init__(self, fieldname, design_id=None):
+    def __init__(self, fieldname, design_id=None, platerun=None):
         """
 
         Parameters
@@ -165,11 +384,17 @@ class Field:
         fieldname : str
             field name. These can be found in the Platerun summary files
         designID : int
+        platerun : str
+            platerun of the field. If None, all plateruns are searched.
         """
         self.name = fieldname
         self.designID = design_id
-        self._pd_indx = self._indx_in_platedata()
-        self._pdata = _main_platedata[self._pd_indx] # row for field
+        if platerun is None:
+            self._platedata = main_platedata()
+        else:
+            self._platedata = platedata(platerun)
+        self._pd_indx = self._indx_in_platedata(design_index(platerun))
+        self._pdata = self._platedata[self._pd_indx] # row for field
         # Get designID if not specified, IF specified, just recopy
         self.designID = self._fetch_designID()
         self.epoch = self._get_epoch()
@@ -182,8 +407,9 @@ class Field:
                                                       self.name,
                                                       self.designID)
         self._fiber_filling = self._get_filling_scheme()
-        self._program_priorities = io.load_fiveplates_priority(self.platerun,
-                                                               self._fiber_filling)
+        self._program_priorities = get_priority_table(self.platerun,
+                                                      self._fiber_filling)
+        self._cartons_table = get_cartons_table(self.platerun)
 
     def __repr__(self):
         return f'five_plates Field({self.name!r})'
@@ -193,24 +419,23 @@ class Field:
         second = f'platerun ID: {self.platerun!r}'
         return first + second
 
-    def _indx_in_platedata(self):
-        # initial index
-        indx = _main_platedata.loc_indices[self.name]
-        if isinstance(indx, list):  # multiple indices
-            # better have DesignID then
-            try:
-                # Five plates MAY have multiple lines in plate_data that correspond
-                # to EXACT SAME design. Need to be flexible here.
-                indx = _main_platedata.loc_indices['designid', self.designID]
-                if isinstance(indx, list):  # multiple lines, one design
-                    indx = indx[0]
-                return indx
-            except TypeError:
-                print('Field: {self.name!r} has multiple designs.')
-                print('Design: {self.designID!r} not found.')
-                print('Please construct Field object with correct designID.')
-        else:  # only one row, yay
-            return indx
+    def _indx_in_platedata(self, index):
+        """
+        row of field in self._platedata, from index (see design_index).
+        """
+        designids, rows = index
+        field_designids = designids[self.name]  # KeyError if not in plate_data
+        if self.designID is None:
+            if len(field_designids) > 1:  # better have DesignID then
+                raise ValueError(f'Field: {self.name!r} has multiple designs '
+                                 f'{field_designids}. Please construct Field '
+                                 'object with correct designID.')
+            return rows[self.name, field_designids[0]]
+        try:
+            return rows[self.name, self.designID]
+        except KeyError:
+            raise ValueError(f'Design: {self.designID!r} of Field: {self.name!r}'
+                             f' not found. Designs are {field_designids}.')
 
     def _fetch_designID(self):
         return self._pdata['designid']
@@ -235,49 +460,21 @@ class Field:
     def firstcarton_program_name(self, carton):
         return carton_to_program(self, carton)
 
-    def _process_plateinput(self, targetlist_filename):
-        targetlist_table = io.fp_plateinput(self.platerun, self.name,
-                                            self.designID, targetlist_filename)
-        if targetlist_table == None:
-            # NO targetlist_table exists! This is for plateruns before MWM_04
-            empty_table = Table()
-            return empty_table
-
-        priority_program_name = parse_program_name_from_file(self.name, self.designID,
-                                                             targetlist_filename)
-        instrument = parse_instrument_name_from_file(self.name, self.designID,
-                                                     targetlist_filename)
-        platerun_priority_N = self._program_priorities.loc[priority_program_name]['order']
-        # add ID values to table
-        Nrows = len(targetlist_table)
-        targetlist_table.add_column(scalar_column(instrument, Nrows, 'instrument'))
-        targetlist_table.add_column(scalar_column(platerun_priority_N,
-                                                  Nrows, 'order_priority'))
-        targetlist_table.add_column(scalar_column(priority_program_name, Nrows,
-                                                  'order_name'))
-        return targetlist_table
-
     def _full_plateinput_table(self):
-        _plateinput_filenames = plateInput_files(self._platedef_params)
-        # APOGEE standards made separately prior to MWM_04! ARRGGGHHH
-        plinput_tables = [self._process_plateinput(targetlist_file) for
-                          targetlist_file in _plateinput_filenames]
-        # if 'apogee_STA' not in targetlist_file]
-        full_table = vstack(plinput_tables)
-        full_table.rename_column('Catalog_id', 'catalogid')
-        full_table.sort('catalogid')
-        full_table.add_column(scalar_column(self.name, len(full_table),
-                                            'field'))
-        full_table.add_column(scalar_column(self.designID, len(full_table),
-                                            'designid'))
-        return full_table
+        return plateinput_table(self.platerun, self.name, self.designID,
+                                self._platedef_params, self._program_priorities)
 
     @property
     def targets(self):  # Loads full plateInput table
         try:
             return self._plateinput
         except AttributeError:
-            self._plateinput = self._full_plateinput_table()
+            cache = targets_cache(self.platerun)
+            if cache is None:
+                self._plateinput = self._full_plateinput_table()
+            else:  # slice of platerun cache
+                targets, slices = cache
+                self._plateinput = targets[slices[self.name, int(self.designID)]]
             return self._plateinput
 
     @property
@@ -304,7 +501,7 @@ class Field:
             self._pseudo_plate = self._sim_science_targs()
             return self._pseudo_plate
 
-    def _sim_science_targs(self, random_seed=None):
+    def _sim_science_targs(self, random_seed=None, min_separation=None):
         """
         Calls process.simulate_platedesign to create table of SCIENCE targets
         that will likey be/ will be assigned a fiber once through plate design.
@@ -312,22 +509,45 @@ class Field:
 
         Parameters
         ----------
-        random_seed : int
+        random_seed : int or numpy SeedSequence
             if None, default random seed in process.simulate_platedesign will
             be used.
+        min_separation : float
+            if given, avoid fiber collisions: assigned targets are at least
+            min_separation (arcsec) apart on the plate. Needs scipy.
         """
         nBOSS_science = self._platedef_params['nBOSS_science']
         nAPOGEE_science = self._platedef_params['nAPOGEE_science']
+        collisions = {'min_separation': min_separation, 'center': self.center}
 
-        if isinstance(random_seed, int):
+        if random_seed is not None:
             return simulate_platedesign(self.targets,
                                         nAPOGEE_science,
                                         nBOSS_science,
-                                        random_seed=random_seed)
+                                        random_seed=random_seed,
+                                        **collisions)
         else:
             return simulate_platedesign(self.targets,
                                         nAPOGEE_science,
-                                        nBOSS_science)
+                                        nBOSS_science,
+                                        **collisions)
+
+    def simulate_ensemble(self, n_realizations=1000, seed=1050,
+                          min_separation=None):
+        """
+        Calls process.simulate_platedesign_ensemble on the targets table.
+        Returns the assignment probability of each row of targets and a
+        table of the expected number of fibers of each priority group.
+        These are exact unless min_separation is given (see
+        _sim_science_targs); then they come from n_realizations designs.
+        """
+        return simulate_platedesign_ensemble(self.targets,
+                                             self._platedef_params['nAPOGEE_science'],
+                                             self._platedef_params['nBOSS_science'],
+                                             n_realizations=n_realizations,
+                                             seed=seed,
+                                             min_separation=min_separation,
+                                             center=self.center)
 
     def _load_table(self, clean_or_input):
         """
@@ -391,24 +611,64 @@ class Field:
 
 
 
+def _load_field(platerun, key, targets=False):
+    """
+    Field of platerun (and its targets if targets) for key (fieldname, designid).
+    Used by Platerun.load_fields, also in worker processes.
+    """
+    fieldname, design_id = key
+    field = Field(fieldname, design_id=design_id, platerun=platerun)
+    if targets:
+        field.targets
+    # tables the Platerun already has; do not pickle them with every field
+    # (pickling also loses their indices). See Platerun._share_tables.
+    del (field._platedata, field._pdata, field._program_priorities,
+         field._cartons_table)
+    return field
+
+
+def _simulate_field(platerun, key, seed, min_separation=None):
+    """
+    Simulated plate design (process.simulate_platedesign) of the field of
+    platerun with key (fieldname, designid). Used by Platerun.simulate,
+    also in worker processes.
+    """
+    fieldname, design_id = key
+    field = Field(fieldname, design_id=design_id, platerun=platerun)
+    return field._sim_science_targs(random_seed=seed,
+                                    min_separation=min_separation)
+
+
 class Platerun:
     """
     Class to act as interface to platerun in five_plates repository.
     """
 
-    def __init__(self, run_name):
+    def __init__(self, run_name, workers=1, progress=None):
+        """
+
+        Parameters
+        ----------
+        run_name : str
+            identifier of platerun, e.g. '2020.08.x.mwm-bhm'
+        workers : int
+            Number of worker processes used to load fields; see load_fields.
+        progress : callable
+            called as progress(N_loaded, N_fields) while fields load.
+        """
         if _check_platerun(run_name):
             pass  # all is well, platerun available
         self.name = run_name
-        self.platedata = io.load_fp_platedata(run_name)
+        self.workers = workers
+        self.progress = progress
+        self.platedata = platedata(run_name)
         self.fieldnames = self._get_fields()
         self.designIDs = self._get_designIDs()
         self._filling_modes = self._get_filling_modes()
-        self._defaultparams = io.load_fp_defaultparams(run_name)
+        self._defaultparams = get_defaultparams(run_name)
         self.fill_priorities = self._parse_fill_priorities()
         self._carton_list_version = self._defaultparams.loc['carton_list_version']['Value']
-        self._cartons_table = io.load_fiveplates_cartons(self.name,
-                                                         self._carton_list_version)
+        self._cartons_table = get_cartons_table(self.name)
 
     def _get_fields(self):
         return list(self.platedata['fieldname'])
@@ -416,9 +676,144 @@ class Platerun:
     def _get_designIDs(self):
         return list(self.platedata['designid'])
 
-    def load_fields(self):
-        return [Field(fieldname, design_id=designID) for fieldname, designID in
-                zip(self.fieldnames, self.designIDs)]
+    def load_fields(self, workers=None, progress=None, targets=False):
+        """
+        Field objects of all fields in platerun, in plate_data order.
+
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes. Default is self.workers.
+            workers=1 loads the fields serially, without a pool. If None
+            here AND in the constructor, use all cpus.
+        progress : callable
+            called as progress(N_loaded, N_fields) after each field is
+            loaded. Default is self.progress.
+        targets : boolean
+            if True, also load the targets of each field (in the workers).
+        """
+        if workers is None:
+            workers = self.workers
+        if workers is None:
+            workers = os.cpu_count()
+        if progress is None:
+            progress = self.progress
+        keys = list(zip(self.fieldnames, self.designIDs))
+        load = partial(_load_field, self.name, targets=targets)
+        workers = min(workers, len(keys))
+        if workers <= 1:
+            fields = map(load, keys)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            chunksize = max(1, len(keys) // (4 * workers))
+            fields = pool.map(load, keys, chunksize=chunksize)
+        loaded = []
+        try:
+            for field in fields:  # in order of keys, whatever the pool does
+                self._share_tables(field)
+                loaded.append(field)
+                if progress is not None:
+                    progress(len(loaded), len(keys))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return loaded
+
+    def simulate(self, workers=None, seed=1050, progress=None,
+                 min_separation=None):
+        """
+        Simulates the plate design of every field in the platerun
+        (see process.simulate_platedesign), in a process pool.
+        Each field gets its own random stream, spawned from seed in
+        plate_data order, so the results do not depend on workers.
+
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes; see load_fields.
+        seed : int
+            root seed of the random streams of the fields.
+        progress : callable
+            called as progress(N_simulated, N_fields). Default is self.progress.
+        min_separation : float
+            if given, avoid fiber collisions; see Field._sim_science_targs.
+
+        Returns
+        -------
+        table of the assigned targets of all fields, sorted by catalogid,
+        with field and designid columns.
+        """
+        if workers is None:
+            workers = self.workers
+        if workers is None:
+            workers = os.cpu_count()
+        if progress is None:
+            progress = self.progress
+        # plate_data may repeat designs, simulate each once
+        keys = list(dict.fromkeys(zip(self.fieldnames, self.designIDs)))
+        seeds = np.random.SeedSequence(seed).spawn(len(keys))
+        workers = min(workers, len(keys))
+        if workers <= 1:
+            fields = {(field.name, field.designID): field for field in self.fields}
+            plates = (fields[key]._sim_science_targs(random_seed=seed_,
+                                                     min_separation=min_separation)
+                      for key, seed_ in zip(keys, seeds))
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            chunksize = max(1, len(keys) // (4 * workers))
+            plates = pool.map(partial(_simulate_field, self.name,
+                                      min_separation=min_separation),
+                              keys, seeds, chunksize=chunksize)
+        simulated = []
+        try:
+            for plate in plates:  # in order of keys, whatever the pool does
+                simulated.append(plate)
+                if progress is not None:
+                    progress(len(simulated), len(keys))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        table, _ = merge_sorted(simulated)
+        return table
+
+    def _share_tables(self, field):
+        """
+        Gives field the plate_data and priority tables of the platerun.
+        """
+        field._platedata = self.platedata
+        field._pdata = self.platedata[field._pd_indx]
+        field._program_priorities = self.fill_priorities[field._fiber_filling]
+        field._cartons_table = self._cartons_table
+        return None
+
+    def build_cache(self):
+        """
+        Parses the targetlists of all fields in the platerun in one pass
+        over the targetlists zip (no Field objects are made) and writes
+        them to one cache file for the platerun (paths.fp_targets_cache).
+        The cache has the instrument, order_priority and order_name columns.
+        Field.targets of fields in this platerun are then slices of the
+        cache. Build again after pulling five_plates; a stale cache is ignored.
+        """
+        field_tables = {}
+        targetlists_zip = paths.fiveplates_targetlists(self.name)
+        with io.zipfiles.open(targetlists_zip) as tl_zip:
+            for fieldname, design_id, fill_mode in zip(self.fieldnames,
+                                                       self.designIDs,
+                                                       self.platedata['fiberfilling']):
+                key = (fieldname, int(design_id))
+                if key in field_tables:  # plate_data may repeat designs
+                    continue
+                params = io.fp_platedef_params(self.name, fieldname,
+                                               design_id, tl_zip=tl_zip)
+                field_tables[key] = plateinput_table(self.name, fieldname,
+                                                     design_id, params,
+                                                     self.fill_priorities[fill_mode],
+                                                     tl_zip=tl_zip)
+        _write_targets_cache(self.name, field_tables)
+        return None
 
     def _get_filling_modes(self):
         return list(set(self.platedata['fiberfilling']))
@@ -427,7 +822,7 @@ class Platerun:
         """
         Construct dictionary of filling_modes to list of par
         """
-        return {fill_mode: io.load_fiveplates_priority(self.name, fill_mode) for
+        return {fill_mode: get_priority_table(self.name, fill_mode) for
                 fill_mode in self._filling_modes}
 
     @property
@@ -443,21 +838,31 @@ class Platerun:
         try:
             return self._targets
         except AttributeError:
-            print(f"""Please be patient.
-                      Initial target loading can take up to 1 second per field.
-                      Loading target data from {len(self.fieldnames)} Fields...""")
+            if not hasattr(self, '_fields'):  # load fields AND targets at once
+                self._fields = self.load_fields(targets=True)
             self._targets = self._load_table()
             return self._targets
 
     def _load_table(self):
         """
         Takes all fields within platerun and combines target tables.
+        Field tables are already sorted by catalogid, so they are merged
+        (util.merge_sorted), not stacked and sorted again.
+        self._field_rows keeps the rows of targets that came from each field.
         """
 
-        table = vstack([field.targets for field in self.fields])
-        table.sort('catalogid')
+        table, field_rows = merge_sorted([field.targets for field in self.fields])
+        self._field_rows = {(field.name, field.designID): rows for field, rows
+                            in zip(self.fields, field_rows)}
         return table
 
+    def field_targets(self, fieldname, design_id):
+        """
+        Rows of targets that came from field fieldname with design design_id.
+        """
+        self.targets  # make sure targets are loaded
+        return self.targets[self._field_rows[fieldname, design_id]]
+
     def _contains(self, catIDs):
         """
         Checks for membership in a plate based on catalogID.
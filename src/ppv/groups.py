@@ -1,19 +1,22 @@
 from . import ppv
 from . import plate
+from .util import group_rows, merge_sorted
 import numpy as np
 from astropy import units as u
 from astropy.coordinates import SkyCoord
 from astropy.time import Time
-from astropy.table import vstack, Column
-from copy import copy
+from astropy.table import Column
 
 
 def available_plateruns():
     return ppv.available_plateruns()
 
 
+_no_rows = np.zeros(0, dtype=int)
+
+
 def indx_in_plateruns(fieldname):
-    return np.where(ppv._names_array == fieldname)[0]
+    return ppv._fieldname_rows.get(fieldname, _no_rows)
 
 
 def plates_of_field(fieldname):  # returns a list
@@ -22,30 +25,103 @@ def plates_of_field(fieldname):  # returns a list
 
 
 def in_platerun(run_name):
-    return np.where(ppv._platerun_array == run_name)[0]
+    return ppv._platerun_rows.get(run_name, _no_rows)
+
+
+def first_plate_of_designs(fieldname):
+    """
+    plates of field, keeping only the first plate of each design.
+    """
+    indx = indx_in_plateruns(fieldname)
+    plates = ppv.allplate_summary['plateid'][indx]
+    designids = ppv.allplate_summary['designid'][indx]
+    _, first_indx = np.unique(np.asarray(designids), return_index=True)
+    return plates[np.sort(first_indx)].tolist()
+
+
+class _TargetGroups:
+    """
+    targets_of and the science/standard/sky subsets, shared by Field and
+    Platerun. Subclasses provide targets and set self._group_index = {}
+    and self._subsets = {}.
+    """
+
+    def targets_of(self, value, column='targettype'):
+        """
+        Rows of targets with value in column ('targettype' or 'holetype');
+        e.g., targets_of('sky') OR targets_of('BOSS', column='holetype').
+        The row indices of each value are found once per column
+        (util.group_rows); each subset table is made once and kept, so
+        repeated access returns the same table.
+        """
+        try:
+            return self._subsets[column, value]
+        except KeyError:
+            pass
+        if column not in self._group_index:
+            if column not in self.targets.colnames:
+                raise ValueError(f'targets have no {column!r} column; '
+                                 f'include {column!r} in columns= to select '
+                                 f'targets by {column}')
+            self._group_index[column] = group_rows(self.targets[column])
+        subset = self.targets[self._group_index[column].get(value, _no_rows)]
+        self._subsets[column, value] = subset
+        return subset
+
+    @property
+    def science_targets(self):
+        return self.targets_of('science')
 
+    @property
+    def standard_targets(self):
+        return self.targets_of('standard')
+
+    @property
+    def sky_targets(self):
+        return self.targets_of('sky')
 
-class Field:
+
+class Field(_TargetGroups):
     """
     Class to act as interface to fields.
+
+    Constructing a Field only uses ppv.allplate_summary. The plates
+    (and plugHoles files) are loaded on first access of plates or targets.
     """
 
-    def __init__(self, fieldname):
+    def __init__(self, fieldname, plates=None, workers=1, columns=None,
+                 unique_designs=False):
         """
         fieldname is string. Look for fieldnames in ppv.allplate_summary OR
         in plate_run.fieldnames
+
+        plates is an optional list of already loaded plate.Plate objects of
+        the field. Otherwise, plates are loaded with plate.load_plates using
+        workers processes when first needed.
+
+        columns is an optional list of plugHoles columns to load; e.g.,
+        ['catalogid', 'target_ra', 'target_dec']. See plate.Plate.
+
+        If unique_designs is True, only the first plate of each design is
+        loaded. Plates of the same design have the same targets.
         """
         self.name = fieldname
         self._platenums = plates_of_field(self.name)
+        if unique_designs:
+            self._load_platenums = first_plate_of_designs(self.name)
+        else:
+            self._load_platenums = self._platenums
         self._summary_indx = indx_in_plateruns(self.name)
         self.ra, self.dec = self._center()
-        self.center = SkyCoord(self.ra * u.deg, self.dec * u.deg,
-                               obstime=Time(2015.5, format='decimalyear'))
         # TODO check epoch of field designation
         self.platerun, self.programname = self.meta()
         self._radius = 1.49 * u.degree
-        self._plates = [plate.Plate(platenum) for platenum in self._platenums]
-        # self._plugHoles = [plate.get_table(platenum) for platenum in self._plates]
+        self._workers = workers
+        self._columns = columns
+        self._group_index = {}   # see _TargetGroups.targets_of
+        self._subsets = {}
+        if plates is not None:
+            self._plates = plates
 
     def __repr__(self):
         return f'Field({self.name!r})'
@@ -57,7 +133,22 @@ class Field:
 
     @property
     def plates(self):
-        return self._plates
+        try:
+            return self._plates
+        except AttributeError:
+            self._plates = plate.load_plates(self._load_platenums,
+                                             workers=self._workers,
+                                             columns=self._columns)
+            return self._plates
+
+    @property
+    def center(self):
+        try:
+            return self._center_coord
+        except AttributeError:
+            self._center_coord = SkyCoord(self.ra * u.deg, self.dec * u.deg,
+                                          obstime=Time(2015.5, format='decimalyear'))
+            return self._center_coord
 
     def _center(self):
         ra = ppv.allplate_summary['raCen'][self._summary_indx][0]
@@ -98,31 +189,34 @@ class Field:
             self._targets = self._load_table()
             return self._targets
 
-    @property
-    def science_targets(self):
-        try:
-            return self._science_targets
-        except AttributeError:
-            _tmp = self._load_table()
-            self._science_targets = _tmp[_tmp['targettype'] == 'science']
-            return self._science_targets
-
     def _load_table(self):
         """
         Takes all converts plates in field and combines target tables.
         Creates new column with the fieldname. While repititive, this will
         make Plateruns much easier to implement.
+
+        Plate tables are already sorted by catalogid, so they are merged
+        (util.merge_sorted), not stacked and sorted again.
+        self._plate_rows keeps the rows of targets that came from each plate.
         """
 
-        table = copy(vstack([pl.targets for pl in self.plates]))
+        table, plate_rows = merge_sorted([pl.targets for pl in self.plates])
+        self._plate_rows = dict(zip([pl.platenum for pl in self.plates],
+                                    plate_rows))
         N_targets = len(table)
         field_column = Column(data=[self.name] * N_targets,
                               name='field',
                               dtype='S200')
         table.add_column(field_column)
-        table.sort('catalogid')   # sort by catalogID
         return table
 
+    def plate_targets(self, platenum):
+        """
+        Rows of targets that came from plate platenum.
+        """
+        self.targets  # make sure targets are loaded
+        return self.targets[self._plate_rows[platenum]]
+
     def _contains(self, catIDs):
         """
         Checks for membership in a plate based on catalogID.
@@ -167,15 +261,30 @@ class Field:
             return np.in1d(np.array([catIDs]), self.targets['catalogid'])
 
 
-class Platerun:
+class Platerun(_TargetGroups):
     """
     Class to act as interface to platerun.
     """
 
-    def __init__(self, run_name):
+    def __init__(self, run_name, workers=1, columns=None, unique_designs=False):
+        """
+        workers is the number of processes used to load the plates of
+        the platerun; see plate.load_plates. None uses all cpus.
+
+        columns is an optional list of plugHoles columns to load; e.g.,
+        ['catalogid', 'target_ra', 'target_dec']. See plate.Plate.
+
+        If unique_designs is True, only the first plate of each design is
+        loaded; see Field.
+        """
         if _check_platerun(run_name):
             pass  # all is well, platerun available
         self.name = run_name
+        self.workers = workers
+        self.columns = columns
+        self.unique_designs = unique_designs
+        self._group_index = {}   # see _TargetGroups.targets_of
+        self._subsets = {}
         self.fieldnames = self._get_fields()
 
     def _get_fields(self):
@@ -188,9 +297,26 @@ class Platerun:
         return ppv.allplate_summary[in_platerun(self.name)]
 
 
-    def load_fields(self):
-        return [Field(fname) for fname in
-                self.fieldnames]
+    def load_fields(self, workers=None):
+        """
+        Loads all fields, all plates of the platerun in one plate.load_plates call.
+        workers defaults to self.workers.
+        """
+        if workers is None:
+            workers = self.workers
+        if self.unique_designs:
+            field_platenums = [first_plate_of_designs(fname) for fname
+                               in self.fieldnames]
+        else:
+            field_platenums = [plates_of_field(fname) for fname in self.fieldnames]
+        all_platenums = [platenum for platenums in field_platenums
+                         for platenum in platenums]
+        all_plates = plate.load_plates(all_platenums, workers=workers,
+                                       columns=self.columns)
+        plates_by_num = dict(zip(all_platenums, all_plates))
+        return [Field(fname, plates=[plates_by_num[platenum] for platenum in platenums],
+                      columns=self.columns, unique_designs=self.unique_designs)
+                for fname, platenums in zip(self.fieldnames, field_platenums)]
 
     @property
     def fields(self):
@@ -214,12 +340,23 @@ class Platerun:
     def _load_table(self):
         """
         Takes all fields within platerun and combines target tables.
+        Field tables are already sorted by catalogid, so they are merged
+        (util.merge_sorted), not stacked and sorted again.
+        self._field_rows keeps the rows of targets that came from each field.
         """
 
-        table = vstack([field.targets for field in self.fields])
-        table.sort('catalogid')   # sort by catalogID
+        table, field_rows = merge_sorted([field.targets for field in self.fields])
+        self._field_rows = dict(zip([field.name for field in self.fields],
+                                    field_rows))
         return table
 
+    def field_targets(self, fieldname):
+        """
+        Rows of targets that came from field fieldname.
+        """
+        self.targets  # make sure targets are loaded
+        return self.targets[self._field_rows[fieldname]]
+
     def _contains(self, catIDs):
         """
         Checks for membership in a plate based on catalogID.
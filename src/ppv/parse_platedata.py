@@ -2,34 +2,140 @@ from . import _fp_available
 from .data import io
 from .util import paths
 from astropy.table import Table, vstack
+from astropy.io import fits
+import os
+import warnings
 
 
 # plateruns are all plateruns that are availble with platedata files.
 # see fiveplates module for call
 
+# Parsed plate_data tables are cached on disk in a single FITS file,
+# one HDU per platerun. Each HDU records the path and mtime of the
+# plate_data file it was parsed from so only changed plateruns get re-parsed.
+
+_cache = None   # {platerun: table}, read from disk on first use
+_unsaved = set()   # plateruns re-parsed but not yet written to disk
+
+
+def _source_signature(platedata_path):
+    return os.fspath(platedata_path), platedata_path.stat().st_mtime_ns
+
+
+def _read_cache():
+    """
+    Reads all cached plate_data tables (one file read). Empty if no cache yet.
+    """
+    cache_file = paths.fp_platedata_cache()
+    tables = {}
+    if not cache_file.exists():
+        return tables
+    try:
+        with fits.open(os.fspath(cache_file)) as hdul:
+            for hdu in hdul[1:]:
+                table = Table.read(hdu, character_as_bytes=False)
+                tables[table.meta['PLATERUN']] = table
+    except (OSError, KeyError):  # corrupt or old cache, rebuild it
+        return {}
+    return tables
+
+
+def _cached_tables():
+    global _cache
+    if _cache is None:
+        _cache = _read_cache()
+    return _cache
+
+
+def write_cache():
+    """
+    Writes all platerun tables in the cache to disk if any were re-parsed.
+    Failing to write (e.g., unusable cache_dir) is not an error, but warns;
+    the tables stay cached in memory.
+    """
+    if not _unsaved:
+        return None
+    hdus = [fits.PrimaryHDU()]
+    for platerun, table in _cached_tables().items():
+        hdu = fits.table_to_hdu(table)
+        hdu.header['PLATERUN'] = platerun
+        hdus.append(hdu)
+    # write to a temporary file first, readers never see a partial cache
+    cache_file = paths.fp_platedata_cache()
+    cache_tmp = cache_file.with_suffix(f'.{os.getpid()}.fits')
+    try:
+        io._check_for_cache_dir()
+        fits.HDUList(hdus).writeto(os.fspath(cache_tmp), overwrite=True)
+        os.replace(os.fspath(cache_tmp), os.fspath(cache_file))
+    except OSError as error:
+        warnings.warn(f'Unable to write cache {os.fspath(cache_file)}: {error}')
+        return None
+    _unsaved.clear()
+    return None
+
+
+def _is_fresh(table, platedata_path):
+    signature = (table.meta.get('SRCPATH'), table.meta.get('SRCMTIME'))
+    return signature == _source_signature(platedata_path)
+
+
+def _platedata_from_cache(table):
+    """
+    Copy of cached table without the cache bookkeeping in meta.
+    Keeps meta from conflicting when plateruns are stacked.
+    """
+    platedata = table.copy()
+    for key in ('PLATERUN', 'SRCPATH', 'SRCMTIME'):
+        platedata.meta.pop(key, None)
+    return platedata
+
+
+def fp_platedata(platerun, save=True):
+    """
+    plate_data table of a single platerun with fieldname and designid indices.
+    Returns None if the platerun does not have a plate_data file (yet).
+
+    The table comes from the on-disk cache unless the plate_data file
+    changed since it was cached; then it is parsed again and the cache updated.
+
+    Parameters
+    ----------
+    platerun : str
+        identifier of platerun, e.g. '2020.08.x.mwm-bhm'
+    save : boolean
+        if False, a re-parsed table is only cached in memory until
+        write_cache() is called. Useful when parsing many plateruns.
+    """
+    platedata_path = paths.fp_platedata(platerun)
+    if platedata_path is None:
+        return None
+    cached = _cached_tables().get(platerun)
+    if cached is None or not _is_fresh(cached, platedata_path):
+        cached = io.load_fp_platedata(platerun)
+        cached.meta['SRCPATH'], cached.meta['SRCMTIME'] = \
+            _source_signature(platedata_path)
+        _cached_tables()[platerun] = cached
+        _unsaved.add(platerun)
+        if save:
+            write_cache()
+    platedata = _platedata_from_cache(cached)
+    platedata.add_index('fieldname')
+    platedata.add_index('designid')
+    return platedata
 
-def fp_plateplans(plateruns):
-    platedata_paths = [paths.fp_platedata(prun) for prun in plateruns]
-
-    prun_to_path = dict(zip(plateruns, platedata_paths))
-
-    pruns_to_parse_path = dict(filter(lambda prun_path: prun_path[1], prun_to_path.items()))
-    pruns_to_parse = list(pruns_to_parse_path.keys())
-
-    platedata_tables = [io.load_fp_platedata(prun) for prun
-                        in pruns_to_parse]
 
+def fp_plateplans(plateruns):
+    """
+    plate_data of all plateruns in one table, indexed by fieldname and designid.
+    Only plateruns whose plate_data files changed are parsed again; the
+    cache is written (at most) once.
+    """
+    platedata_tables = [fp_platedata(prun, save=False)
+                        for prun in plateruns]
     platedata_tables = list(filter(None, platedata_tables))
+    write_cache()
 
     main_platedata = vstack(platedata_tables)
     main_platedata.add_index('fieldname')
     main_platedata.add_index('designid')
     return main_platedata
-
-
-
-
-
-
-
-
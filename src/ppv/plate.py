@@ -1,9 +1,13 @@
 from .util import paths, download
+from .data import io
 from . import util, config
 from astropy.table import Table, Column
 from astropy.coordinates import SkyCoord
 from astropy.time import Time
 from pydl.pydlutils.yanny import yanny
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from numpy.lib.recfunctions import repack_fields
 import astropy.units as u
 import os
 import numpy as np
@@ -19,7 +23,30 @@ dtypes = [np.float, np.float, 'U', 'U', np.uint,
 _field_dtypes = [(name, dtype) for name, dtype in zip(fields, dtypes)]
 
 
-def load_yanny(platenum):
+def _field_dtypes_of(columns):
+    """
+    _field_dtypes of only columns, in the order of fields.
+    catalogid is always included; all tables are sorted by it.
+
+    Parameters
+    ----------
+    columns : list of str
+        subset of fields. If None, all fields.
+    """
+    if columns is None:
+        return _field_dtypes
+    columns = set(columns) | {'catalogid'}
+    unknown = columns - set(fields)
+    if unknown:
+        raise ValueError(f'Unknown plugHoles columns: {sorted(unknown)}. '
+                         f'Available columns are {fields}')
+    return [(name, dtype) for name, dtype in _field_dtypes if name in columns]
+
+
+def _plateholes_path(platenum):
+    """
+    path to plugHoles file of platenum, rsync-ing the plate batch if needed.
+    """
     platepath = paths.plateholes(platenum)
 
     if platepath.exists():
@@ -30,23 +57,189 @@ def load_yanny(platenum):
         print(f'{os.fspath(platepath)} does not exist. Getting files via rsync now')
         print(f'--- Please enter your password for {config.utah_username} below --')
         download.plugHoles_batch(platebatch)
+    return platepath
 
-    filepath = os.fspath(paths.plateholes(platenum))
+
+def load_yanny(platenum):
+    filepath = os.fspath(_plateholes_path(platenum))
     pholes_obj = yanny(filepath, raw=True)
     return pholes_obj
 
+
+def load_plugholes(platenum, use_cache=True, columns=None):
+    """
+    Reads plugHoles file of platenum with the fast yanny reader.
+    The parsed file is saved as a binary sidecar in config.cache_dir and
+    later loads read the sidecar instead. Sidecars are remade when the
+    mtime or size of the plugHoles file changes.
+
+    Parameters
+    ----------
+    platenum : int
+        Number of plate; e.g., 15004
+    use_cache : boolean
+        if False, always parse the plugHoles file and skip the sidecar.
+    columns : list of str
+        only load these columns (plus catalogid). If None, all fields.
+        Without a sidecar, only these columns are parsed and no sidecar
+        is written.
+
+    Returns
+    -------
+    header : dict
+        keyword/value pairs before the table; e.g., 'raCen', 'platerun'
+    holes : numpy structured array
+        STRUCT1 table with the columns (and dtypes) in _field_dtypes
+    """
+    platepath = _plateholes_path(platenum)
+    field_dtypes = _field_dtypes_of(columns)
+    if not use_cache:
+        return io.read_yanny_struct(platepath, 'STRUCT1', field_dtypes)
+
+    sidecar_path = paths.plateholes_cache(platenum)
+    names = None if columns is None else [name for name, _ in field_dtypes]
+    cached = io.load_sidecar(platepath, sidecar_path, fields, columns=names)
+    if cached is not None:
+        return cached
+    if columns is not None:
+        return io.read_yanny_struct(platepath, 'STRUCT1', field_dtypes)
+    header, holes = io.read_yanny_struct(platepath, 'STRUCT1', _field_dtypes)
+    io.write_sidecar(platepath, sidecar_path, header, holes)
+    return header, holes
+
+def _default_archive():
+    from . import archive  # imported here, archive needs plate
+    return archive.default_archive()
+
+
+def archived_targets(platenum, columns=None, archive=None):
+    """
+    Targets table of platenum (the fields, or only columns, and plate) made
+    of zero-copy, read-only slices of the plugHoles archive, sorted by
+    catalogid. No plugHoles file or sidecar is read. None if the archive
+    was not built or does not have the plugHoles file of platenum as it
+    is now (see archive.PlugHolesArchive.is_fresh).
+
+    Parameters
+    ----------
+    columns : list of str
+        see load_plugholes.
+    archive : archive.PlugHolesArchive
+        Default is the default archive (archive.default_archive).
+    """
+    if archive is None:
+        archive = _default_archive()
+    if archive is None or not archive.is_fresh(platenum):
+        return None
+    names = [name for name, _ in _field_dtypes_of(columns)] + ['plate']
+    return archive.plate_table(platenum, columns=names)
+
+
 def get_dict(platenum):
     pholes_obj = load_yanny(platenum)
     holes_dict = pholes_obj['STRUCT1']
     return holes_dict
 
-# TODO make get table more flexible (different columns)
-def get_table(platenum):
-    holes_dict = get_dict(platenum)
-    data = [np.array(holes_dict[field], dtype=dd) for field, dd
-            in _field_dtypes]
-    plate_table = Table(data=data,
-                        names=fields)
+def load_plugholes_header(platenum):
+    """
+    Only the keywords of the plugHoles file of platenum; e.g., 'raCen',
+    'platerun'. Taken from the sidecar if it is fresh, otherwise only the
+    top of the plugHoles file is read.
+    """
+    platepath = _plateholes_path(platenum)
+    header = io.load_sidecar_header(platepath, paths.plateholes_cache(platenum))
+    if header is None:
+        header = io.read_yanny_header(platepath)
+    return header
+
+
+def _load_plugholes_array(platenum, columns=None):
+    """
+    load_plugholes for worker processes. Returns a plain, packed array,
+    not a view of the sidecar columns.
+    """
+    header, holes = load_plugholes(platenum, columns=columns)
+    return header, repack_fields(np.array(holes))
+
+
+def load_plugholes_many(platenums, workers=None, columns=None):
+    """
+    load_plugholes for many plates, parsing plugHoles files in a process pool.
+    Missing plugHoles files are rsync-ed first (in this process).
+
+    Parameters
+    ----------
+    platenums : list of int
+        Numbers of plates; e.g., [15000, 15001]
+    workers : int
+        Number of worker processes. If None, use all cpus.
+        workers=1 loads the plates serially, without a pool.
+    columns : list of str
+        only load these columns; see load_plugholes.
+
+    Returns
+    -------
+    list of (header, holes) tuples in the same order as platenums.
+    """
+    platenums = list(platenums)
+    for platenum in platenums:
+        _plateholes_path(platenum)  # rsync now, not in the workers
+    if workers is None:
+        workers = os.cpu_count()
+    workers = min(workers, len(platenums))
+    if workers <= 1:
+        return [load_plugholes(platenum, columns=columns) for platenum in platenums]
+    chunksize = max(1, len(platenums) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(_load_plugholes_array, columns=columns),
+                             platenums, chunksize=chunksize))
+
+
+def load_plates(platenums, workers=None, tables=False, columns=None):
+    """
+    Loads many plates at once, parsing plugHoles files in a process pool.
+    See load_plugholes_many.
+
+    Parameters
+    ----------
+    platenums : list of int
+        Numbers of plates; e.g., [15000, 15001]
+    workers : int
+        Number of worker processes. If None, use all cpus.
+        workers=1 loads the plates serially, without a pool.
+    tables : boolean
+        if True, return astropy tables of STRUCT1 instead of Plate objects.
+    columns : list of str
+        only load these columns; see load_plugholes.
+
+    Returns
+    -------
+    list of Plate objects (or tables) in the same order as platenums.
+    Plates in the plugHoles archive (if built) are not parsed; their
+    targets are slices of the archive, see archived_targets.
+    """
+    platenums = list(platenums)
+    archive = _default_archive()
+    archived = set() if archive is None else {platenum for platenum in platenums
+                                              if archive.is_fresh(platenum)}
+    to_parse = [platenum for platenum in platenums if platenum not in archived]
+    parsed = dict(zip(to_parse, load_plugholes_many(to_parse, workers=workers,
+                                                    columns=columns)))
+    if tables:
+        names = [name for name, _ in _field_dtypes_of(columns)]
+        return [archive.plate_table(platenum, columns=names)
+                if platenum in archived else Table(data=parsed[platenum][1])
+                for platenum in platenums]
+    return [Plate(platenum, plugholes=parsed.get(platenum), columns=columns)
+            for platenum in platenums]
+
+
+def get_table(platenum, columns=None):
+    """
+    Table of STRUCT1 of plugHoles file. columns: see load_plugholes.
+    """
+    _, holes = load_plugholes(platenum, columns=columns)
+    plate_table = Table(data=holes)
     return plate_table
 
 def yanny_to_dict(yanny_obj):
@@ -66,29 +259,44 @@ class Plate():
     """
     Container class for plate and plugHoles data.
     Typically used to read in plugHoles parameter files.
+
+    Only the plugHoles keywords are read on construction. The targets table,
+    epoch and center are built on first access. The targets table is made
+    of read-only slices of the plugHoles archive if the archive has the
+    plate (see archived_targets), otherwise the plugHoles file is read.
     """
 
-    def __init__(self, platenum):
+    __slots__ = ('platenum', 'name', '_plugHoles', '_holes', '_targets',
+                 '_columns', '_epoch_', '_center_', 'ra', 'dec', 'platerun',
+                 'designID')
+
+    _radius = 1.49 * u.degree  # assuming APO
+
+    def __init__(self, platenum, plugholes=None, columns=None):
         """
 
         Parameters
         ----------
         platenum : int
             Number of plate; e.g., 15004
+        plugholes : tuple
+            (header, holes) output of load_plugholes, if already loaded.
+            Used by load_plates.
+        columns : list of str
+            only load these columns of the targets table (plus catalogid).
+            If None, all of fields. e.g., ['catalogid', 'target_ra', 'target_dec']
         """
         self.platenum = platenum
         self.name = platenum
-        # load plugHoles parameter file
-        self._plugHoles = load_yanny(platenum)
-        self.targets = self._load_table()
+        self._columns = columns
+        # load keywords of plugHoles parameter file, table is loaded on demand
+        if plugholes is None:
+            self._plugHoles = load_plugholes_header(platenum)
+        else:
+            self._plugHoles, self._holes = plugholes
         self.ra, self.dec = self._center()
-        self._radius = 1.49 * u.degree  # assuming APO
-        self._epoch = self._get_epoch()
         self.platerun = self.property('platerun')
         self.designID = self.property('designid')
-        self.center = SkyCoord(self.ra * u.degree, self.dec * u.degree,
-                               obstime=Time(self._epoch, format='decimalyear'))
-
 
     def __repr__(self):
         return f'Plate({self.platenum!r})'
@@ -102,9 +310,46 @@ class Plate():
     def __getattr__(self, attr):
         """
         Gets column for plate data table.
+        Only called for attributes that are not set (yet), private ones included.
         """
+        if attr.startswith('_'):
+            raise AttributeError(attr)
         return self.targets[attr]
 
+    @property
+    def targets(self):
+        try:
+            return self._targets
+        except AttributeError:
+            try:
+                holes = self._holes
+                del self._holes  # only needed once
+            except AttributeError:
+                targets = archived_targets(self.platenum, columns=self._columns)
+                if targets is not None:
+                    self._targets = targets
+                    return self._targets
+                _, holes = load_plugholes(self.platenum, columns=self._columns)
+            self._targets = self._load_table(holes)
+            return self._targets
+
+    @property
+    def _epoch(self):
+        try:
+            return self._epoch_
+        except AttributeError:
+            self._epoch_ = self._get_epoch()
+            return self._epoch_
+
+    @property
+    def center(self):
+        try:
+            return self._center_
+        except AttributeError:
+            self._center_ = SkyCoord(self.ra * u.degree, self.dec * u.degree,
+                                     obstime=Time(self._epoch, format='decimalyear'))
+            return self._center_
+
     def property(self, keyword):
         """
         Convenience function for accessing properties of plugHoles parameter file.
@@ -125,17 +370,22 @@ class Plate():
         Gets the epoch of the plate drilling from the epoch of the first science target.
         As far as I know, no other way to do this from the plate par file only.
         """
-        is_science = self.targets['targettype'] == 'science'
+        if 'targettype' in self.targets.colnames and 'epoch' in self.targets.colnames:
+            targets = self.targets
+        else:  # not in the loaded columns, load just these
+            targets = get_table(self.platenum, columns=['targettype', 'epoch'])
+            targets.sort('catalogid')
+        is_science = targets['targettype'] == 'science'
         first_science_idx = np.argwhere(is_science)[0][0]
-        return self.targets[first_science_idx]['epoch']
+        return targets[first_science_idx]['epoch']
 
-    def _load_table(self):
+    def _load_table(self, holes):
         """
-        converts STRUCT1 of yanny object to astropy table.
+        converts STRUCT1 structured array to astropy table.
         Creates new column with the platenumber. While repititive, this will
         make Fields and Plateruns much easier to implement.
         """
-        table = dict_to_table(yanny_to_dict(self._plugHoles))
+        table = Table(data=holes, copy=False)
         N_targets = len(table)
         plate_column = Column(data=[self.platenum] * N_targets,
                               name='plate',
@@ -6,9 +6,13 @@ plate design to get a better idea of what WILL be observed.
 
 """
 
-from astropy.table import Column, vstack
+from astropy.table import Table
 import numpy as np
 from numpy.random import Generator, PCG64
+try:   # optional, only needed for collision-aware simulations
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
 
 """
 per field:
@@ -28,8 +32,264 @@ per field:
 """
 
 
+def _priority_groups(fp_targets, nSCI_apogee, nSCI_boss):
+    """
+    Priority groups of fp_targets and how plate design fills them.
+    Rows are sorted by order_priority once, and the science priority groups
+    of each instrument are taken whole while the cumulative count fits the
+    number of fibers. The first group that does not fit is the cut-off group;
+    it gets a random subsample of the fibers left.
+    Groups are assumed to have a single instrument and Type (as in five_plates).
+
+    Returns
+    -------
+    by_priority : rows of fp_targets sorted by order_priority (stable)
+    group_start, group_size : position in by_priority and size of each group
+    N_whole : number of rows taken from each group; all or none
+    cutoff_groups : list of (group, N_needed), in priority order
+    """
+    nSCI_goal = {'apogee': nSCI_apogee, 'boss': nSCI_boss}
+
+    priority = np.asarray(fp_targets['order_priority'])
+    by_priority = np.argsort(priority, kind='stable')  # rows in group order
+    _, group_start, group_size = np.unique(priority[by_priority],
+                                           return_index=True,
+                                           return_counts=True)
+    first_rows = by_priority[group_start]
+    group_instrument = np.asarray(fp_targets['instrument'])[first_rows]
+    group_science = np.asarray(fp_targets['Type'])[first_rows] == 0  # no SKY/STD
+
+    N_whole = np.zeros(len(group_size), dtype=np.int64)
+    cutoff_groups = []
+    for instrument, goal in nSCI_goal.items():
+        groups = np.flatnonzero(group_science & (group_instrument == instrument))
+        assigned = np.cumsum(group_size[groups])   # if groups taken whole
+        before = assigned - group_size[groups]
+        whole = assigned <= goal
+        N_whole[groups[whole]] = group_size[groups[whole]]
+        cutoff = np.flatnonzero(~whole & (before < goal))[:1]
+        for group, N_before in zip(groups[cutoff], before[cutoff]):
+            cutoff_groups.append((group, goal - N_before))
+    return by_priority, group_start, group_size, N_whole, sorted(cutoff_groups)
+
+
+def platedesign_indices(fp_targets, nSCI_apogee, nSCI_boss,
+                        random_seed=1050):
+    """
+    Row indices of fp_targets assigned a fiber by simulate_platedesign,
+    sorted by catalogid. See simulate_platedesign for the parameters.
+    """
+    RandomState = Generator(PCG64(random_seed))
+    by_priority, group_start, group_size, N_taken, cutoff_groups = \
+        _priority_groups(fp_targets, nSCI_apogee, nSCI_boss)
+
+    # rank of each (priority sorted) row within its group: its position, or
+    # its order of selection in a cut-off group (drawn in priority order)
+    group_of_row = np.repeat(np.arange(len(group_size)), group_size)
+    rank = np.arange(len(by_priority)) - np.repeat(group_start, group_size)
+    for group, N_needed in cutoff_groups:
+        keep_rows_indx = RandomState.choice(group_size[group], N_needed,
+                                            replace=False)
+        rank[group_start[group]:group_start[group] + group_size[group]] = N_needed
+        rank[group_start[group] + keep_rows_indx] = np.arange(N_needed)
+        N_taken[group] = N_needed
+    taken = rank < N_taken[group_of_row]
+    selection = np.lexsort((rank[taken], group_of_row[taken]))
+    indices = by_priority[taken][selection]
+    catalogids = np.asarray(fp_targets['catalogid'])[indices]
+    return indices[np.argsort(catalogids)]
+
+
+def tangent_plane(ra, dec, center):
+    """
+    Gnomonic (tangent plane) projection of ra, dec (degrees) around center.
+    Returns xi, eta in arcsec.
+
+    Parameters
+    ----------
+    center : SkyCoord OR (ra, dec) in degrees
+        e.g., fiveplates.Field.center
+    """
+    if hasattr(center, 'ra'):
+        center = (center.ra.deg, center.dec.deg)
+    ra0, dec0 = np.radians(center[0]), np.radians(center[1])
+    ra, dec = np.radians(np.asarray(ra)), np.radians(np.asarray(dec))
+    cos_c = (np.sin(dec0) * np.sin(dec) +
+             np.cos(dec0) * np.cos(dec) * np.cos(ra - ra0))
+    xi = np.cos(dec) * np.sin(ra - ra0) / cos_c
+    eta = (np.cos(dec0) * np.sin(dec) -
+           np.sin(dec0) * np.cos(dec) * np.cos(ra - ra0)) / cos_c
+    return np.degrees(xi) * 3600, np.degrees(eta) * 3600
+
+
+def _collision_groups(fp_targets, nSCI_apogee, nSCI_boss, center,
+                      min_separation):
+    """
+    The parts of collision_free_indices that do not depend on the seed,
+    computed once for any number of realizations: the science priority
+    groups (in priority order) with the rows, instrument and neighbors
+    (rows closer than min_separation, from a KD-tree over tangent plane
+    positions around center) of each.
+
+    Returns
+    -------
+    list of (rows, instrument, neighbors); neighbors[i] are the
+    neighbors of rows[i]
+    """
+    if center is None:
+        raise ValueError('min_separation needs the plate center; pass '
+                         'center=SkyCoord OR (ra, dec), e.g., Field.center')
+    if cKDTree is None:
+        raise ImportError('collision-aware plate design simulations need scipy')
+    by_priority, group_start, group_size, _, _ = \
+        _priority_groups(fp_targets, nSCI_apogee, nSCI_boss)
+
+    xi, eta = tangent_plane(fp_targets['RA'], fp_targets['Dec'], center)
+    tree = cKDTree(np.column_stack([xi, eta]))
+    instrument = np.asarray(fp_targets['instrument'])
+    science = np.asarray(fp_targets['Type']) == 0
+    groups = []
+    for start, size in zip(group_start, group_size):
+        rows = by_priority[start:start + size]
+        if not science[rows[0]] or instrument[rows[0]] not in ('apogee', 'boss'):
+            continue
+        # neighbors of the whole group in one query
+        neighbors = tree.query_ball_point(np.column_stack([xi[rows], eta[rows]]),
+                                          r=min_separation)
+        groups.append((rows, instrument[rows[0]], neighbors))
+    return groups
+
+
+def _collision_free_assign(groups, nSCI_apogee, nSCI_boss, N_rows, RandomState):
+    """
+    One realization of collision_free_indices from _collision_groups:
+    row indices assigned a fiber, in order of assignment.
+    """
+    nSCI_needed = {'apogee': nSCI_apogee, 'boss': nSCI_boss}
+    blocked = np.zeros(N_rows, dtype=bool)  # too close to assigned
+    assigned = []
+    for rows, instrument_, neighbors in groups:
+        if nSCI_needed[instrument_] <= 0:
+            continue
+        for i in RandomState.permutation(len(rows)):
+            row = rows[i]
+            if blocked[row]:
+                continue
+            assigned.append(row)
+            blocked[neighbors[i]] = True
+            nSCI_needed[instrument_] -= 1
+            if nSCI_needed[instrument_] == 0:
+                break
+    return np.array(assigned, dtype=np.int64)
+
+
+def collision_free_indices(fp_targets, nSCI_apogee, nSCI_boss, center,
+                           min_separation, random_seed=1050):
+    """
+    Row indices of fp_targets assigned a fiber by a collision-aware
+    simulate_platedesign, sorted by catalogid.
+
+    Priority group by priority group (as simulate_platedesign), the targets
+    of a group are considered in random order and assigned unless they are
+    closer than min_separation to a target assigned already (of either
+    instrument), until the instrument has no fibers left. Neighbors come from
+    a KD-tree over tangent plane positions around center. Needs scipy.
+
+    Parameters
+    ----------
+    center : SkyCoord OR (ra, dec) in degrees
+        center of the plate, e.g., fiveplates.Field.center
+    min_separation : float
+        minimum separation of assigned targets, in arcsec.
+    See simulate_platedesign for the others.
+    """
+    groups = _collision_groups(fp_targets, nSCI_apogee, nSCI_boss, center,
+                               min_separation)
+    indices = _collision_free_assign(groups, nSCI_apogee, nSCI_boss,
+                                     len(fp_targets),
+                                     Generator(PCG64(random_seed)))
+    catalogids = np.asarray(fp_targets['catalogid'])[indices]
+    return indices[np.argsort(catalogids)]
+
+
+def simulate_platedesign_ensemble(fp_targets, nSCI_apogee, nSCI_boss,
+                                  n_realizations=1000, seed=1050,
+                                  min_separation=None, center=None):
+    """
+    How likely each target is to be assigned a fiber by simulate_platedesign.
+
+    Without min_separation this is exact: groups taken whole have
+    probability 1, the cut-off group N_needed / N_targets and the others 0
+    (see _priority_groups); n_realizations and seed are not used.
+    With min_separation (collision-aware designs, collision_free_indices)
+    there is no closed form, so it is the fraction of n_realizations
+    simulated designs that assign each target. The KD-tree, priority
+    groups and neighbor lists are computed once; each realization only
+    draws its permutations.
+
+    Parameters
+    ----------
+    fp_targets : astropy table
+        Almost always the output of fiveplates.Field.targets
+    nSCI_apogee : int
+        Number of APOGEE fibers for science in plate.
+    nSCI_boss : int
+        Number of BOSS fibers for science in plate.
+    n_realizations : int
+        Number of simulated plate designs, with min_separation.
+    seed : int
+        Seed number for random number generator, with min_separation.
+        Each realization gets its own random stream spawned from seed.
+    min_separation : float
+        see simulate_platedesign.
+    center : SkyCoord OR (ra, dec) in degrees
+        see simulate_platedesign.
+
+    Returns
+    -------
+    probability : numpy array
+        assignment probability of each row of fp_targets
+    groups : astropy table
+        per priority group: order_priority, instrument, N_targets and
+        expected_fibers (expected number of fibers assigned)
+    """
+    by_priority, group_start, group_size, N_whole, cutoff_groups = \
+        _priority_groups(fp_targets, nSCI_apogee, nSCI_boss)
+    group_of_row = np.repeat(np.arange(len(group_size)), group_size)
+
+    if min_separation is None:
+        group_probability = (N_whole > 0).astype(np.float64)
+        expected_fibers = N_whole.astype(np.float64)
+        for group, N_needed in cutoff_groups:
+            group_probability[group] = N_needed / group_size[group]
+            expected_fibers[group] = N_needed
+        probability = np.zeros(len(by_priority))
+        probability[by_priority] = group_probability[group_of_row]
+    else:  # KD-tree, groups and neighbors once, only the draws per realization
+        collision_groups = _collision_groups(fp_targets, nSCI_apogee, nSCI_boss,
+                                             center, min_separation)
+        N_assigned = np.zeros(len(fp_targets), dtype=np.int64)
+        for seed_ in np.random.SeedSequence(seed).spawn(n_realizations):
+            N_assigned[_collision_free_assign(collision_groups, nSCI_apogee,
+                                              nSCI_boss, len(fp_targets),
+                                              Generator(PCG64(seed_)))] += 1
+        probability = N_assigned / n_realizations
+        group_of = np.empty(len(by_priority), dtype=np.int64)
+        group_of[by_priority] = group_of_row   # group of each row of fp_targets
+        expected_fibers = np.bincount(group_of, weights=probability,
+                                      minlength=len(group_size))
+
+    first_rows = by_priority[group_start]
+    groups = Table()
+    groups['order_priority'] = np.asarray(fp_targets['order_priority'])[first_rows]
+    groups['instrument'] = np.asarray(fp_targets['instrument'])[first_rows]
+    groups['N_targets'] = group_size
+    groups['expected_fibers'] = expected_fibers
+    return probability, groups
+
+
 def simulate_platedesign(fp_targets, nSCI_apogee, nSCI_boss,
-                         random_seed=1050):
+                         random_seed=1050, min_separation=None, center=None):
     """
     Takes in an astropy table containing a list of fiveplates targets and 
     simulates the plate design code to produce an estimate of what the final
@@ -47,58 +307,22 @@ def simulate_platedesign(fp_targets, nSCI_apogee, nSCI_boss,
     random_seed : int
         Seed number for random number generator. Set to any number.
         Default is 1050 (just *randomly* chosen) for reproducability.
-    """
+    min_separation : float
+        if given, assigned targets are at least min_separation (arcsec)
+        apart; i.e., fiber collisions are avoided (collision_free_indices).
+    center : SkyCoord OR (ra, dec) in degrees
+        center of the plate; needed with min_separation (ValueError if not
+        given).
 
-    # Initiate Random State (fixed)
-    RandomState = Generator(PCG64(1050))
-    # numpy random functions will use this
-
-    # indx_col = Column(np.arange(len(fp_targets), dtype=int), name='indx')
-    # priority_groups = fp_targets['order_priority'].data
-    # indx_groups = indx_col.group_by(priority_groups)
-
-    bypriority = fp_targets.group_by('order_priority')
-    assigned_targets = []
-
-    nSCI_apogee_assigned = 0   # nothing assigned at beginning
-    nSCI_boss_assigned = 0
-
-    nSCI_goal = {}
-    nSCI_assigned = {}
-    nSCI_needed = {}
-
-    nSCI_goal['apogee'] = nSCI_apogee
-    nSCI_goal['boss'] = nSCI_boss
-    nSCI_assigned['apogee'] = nSCI_apogee_assigned
-    nSCI_assigned['boss'] = nSCI_boss_assigned
-
-    for ii, target_grp in enumerate(bypriority.groups):
-        nSCI_needed['apogee'] = nSCI_goal['apogee'] - nSCI_assigned['apogee']
-        nSCI_needed['boss'] = nSCI_goal['boss'] - nSCI_assigned['boss']
-
-        # consider = bypriority.groups[priority]
-        instrument_ = set(target_grp['instrument']).pop()
-        # beter be only ONE instrument!!!
-        Nrows = len(target_grp)
-        # Ignore SKY and STD cartons for now
-        target_type = set(target_grp['Type']).pop()
-
-        if target_type != 0:
-            continue    # SKIP this group
-
-        if Nrows <= nSCI_needed[instrument_]:
-            # Just take whole priority group if it will fit
-            assigned_targets.append(target_grp)
-            nSCI_assigned[instrument_] += Nrows  # increase N of fibers assigned
-        elif nSCI_needed[instrument_] > 0 :   #  Still need to assign fibers
-            keep_rows_indx = RandomState.choice(Nrows,
-                                              nSCI_needed[instrument_],
-                                              replace=False)
-            assigned_targets.append(target_grp[keep_rows_indx])
-            nSCI_assigned[instrument_] += len(keep_rows_indx)
-        else:  # Filled up the plate already
-            pass
-
-    assigned = vstack(assigned_targets)
-    assigned.sort('catalogid')
-    return assigned
+    Returns
+    -------
+    table of assigned targets, sorted by catalogid.
+    Use platedesign_indices for their row indices instead of a table.
+    """
+    if min_separation is not None:
+        return fp_targets[collision_free_indices(fp_targets, nSCI_apogee,
+                                                 nSCI_boss, center,
+                                                 min_separation,
+                                                 random_seed=random_seed)]
+    return fp_targets[platedesign_indices(fp_targets, nSCI_apogee, nSCI_boss,
+                                          random_seed=random_seed)]
@@ -1,5 +1,6 @@
 import pprint
-from astropy.table import Column
+from astropy.table import Column, Table, vstack
+import numpy as np
 
 pp = pprint.PrettyPrinter(indent=4)
 
@@ -21,3 +22,85 @@ def scalar_column(value, Nrows, name):
                   name= name,
                   dtype= type(value))
 
+
+
+def group_rows(column):
+    """
+    Row indices for each unique value of column, from a single sort.
+    Rows of each value stay in table order.
+
+    Parameters
+    ----------
+    column : array-like
+        e.g., a table column like 'targettype'
+
+    Returns
+    -------
+    dict of value : numpy array of row indices
+    """
+    values, inverse = np.unique(np.asarray(column), return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    offsets = np.searchsorted(inverse[order], np.arange(len(values) + 1))
+    return {value: order[start:stop] for value, start, stop
+            in zip(values, offsets[:-1], offsets[1:])}
+
+
+def merge_sorted(tables, key='catalogid'):
+    """
+    Merges tables that are each already sorted by key into one table sorted
+    by key, without re-sorting everything.
+    numpy's stable sort (timsort) finds the pre-sorted runs, so ordering
+    the concatenated keys is a k-way merge. Each column is then filled into
+    one pre-allocated array, no intermediate stacked copy.
+    Ties keep the order of the input tables.
+
+    Tables with different columns, or masked columns, are stacked with
+    astropy's vstack and sorted instead.
+    The merged table keeps the meta of the first table. An empty list of
+    tables gives an empty table.
+
+    Parameters
+    ----------
+    tables : list of astropy tables
+        each sorted by key
+    key : str
+        column name
+
+    Returns
+    -------
+    merged : astropy table
+    source_rows : list of numpy arrays
+        rows of merged that came from each table, in the same order as
+        tables; e.g., merged[source_rows[0]] are the rows of tables[0]
+    """
+    if len(tables) == 0:
+        return Table(), []
+    lengths = [len(table) for table in tables]
+    offsets = np.cumsum([0] + lengths)
+    N_rows = offsets[-1]
+    colnames = tables[0].colnames
+    simple = (all(table.colnames == colnames for table in tables) and
+              not any(table.has_masked_columns for table in tables))
+    if simple:
+        keys = np.concatenate([np.asarray(table[key]) for table in tables])
+        order = np.argsort(keys, kind='stable')
+    else:
+        stacked = vstack(tables, metadata_conflicts='silent')
+        stacked.meta = tables[0].meta
+        order = stacked.argsort(key, kind='stable')
+    rank = np.empty(N_rows, dtype=np.int64)  # where each input row ends up
+    rank[order] = np.arange(N_rows)
+    source_rows = [rank[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
+    if not simple:
+        return stacked[order], source_rows
+
+    merged = Table(meta=tables[0].meta)
+    for colname in colnames:
+        columns = [table[colname] for table in tables]
+        dtype = np.result_type(*[column.dtype for column in columns])
+        merged_column = np.empty((N_rows,) + columns[0].shape[1:], dtype=dtype)
+        for column, rows in zip(columns, source_rows):
+            merged_column[rows] = column
+        merged[colname] = Column(merged_column, name=colname, unit=columns[0].unit,
+                                 description=columns[0].description)
+    return merged, source_rows
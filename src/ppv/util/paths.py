@@ -80,6 +80,47 @@ def plateholes(platenum):
     filename = plateholes_file(platenum)
     return plate(platenum) / filename
 
+#  cache
+##########
+
+def plateholes_cache(platenum):
+    """
+    path to binary sidecar (.npy) of parsed plugHoles file in cache_dir.
+    Its header keywords are kept next to it in a .json file.
+
+    Parameters
+    ----------
+    platenum : int
+        Number of plate
+    """
+    sidecar_file = plateholes_file(platenum).replace('.par', '.npy')
+    return config.cache_dir / 'plateHoles' / plate_batch(platenum).name / sidecar_file
+
+
+def fp_platedata_cache():
+    """
+    path to binary cache of the plate_data tables of all five_plates plateruns.
+    """
+    return config.cache_dir / 'fiveplates_platedata.fits'
+
+def fp_targets_cache(platerun):
+    """
+    path to binary cache of the targets of all fields of a five_plates
+    platerun (see fiveplates.Platerun.build_cache).
+
+    Parameters
+    ----------
+    platerun : str
+        identifier of platerun, e.g. '2020.08.x.mwm-bhm'
+    """
+    return config.cache_dir / 'fiveplates_targets' / f'{platerun}.fits'
+
+def plugholes_archive():
+    """
+    path to directory of the columnar archive of all plugHoles data.
+    """
+    return config.cache_dir / 'plugHoles_archive'
+
 #  five_plates
 ##############
 
@@ -90,12 +131,129 @@ def fiveplates_description():
     description_file = 'plateruns_description.txt'
     return config.fiveplates_dir / description_file
 
+class FivePlatesManifest:
+    """
+    Listing of the five_plates directory and of every directory under it,
+    made with os.scandir once. A directory is only listed again when its
+    mtime changes (files added, removed or renamed, e.g., by a pull), so
+    resolving paths costs one stat instead of a listdir.
+    Plateruns are the directories ending in '(m)apper' at any depth, as
+    found by os.walk; hidden directories (e.g., .git) are not searched.
+    """
+
+    def __init__(self, root=None):
+        self._root = root
+        self._listings = {}  # directory: (mtime_ns, {name: is_dir})
+        self._resolved = {}  # (platerun, role): (mtime_ns, path)
+
+    @property
+    def root(self):
+        return config.fiveplates_dir if self._root is None else self._root
+
+    def _listing(self, directory):
+        """
+        mtime_ns and {name: is_dir} of directory; {} if it does not exist.
+        """
+        directory = os.fspath(directory)
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return None, {}
+        try:
+            listed_mtime_ns, entries = self._listings[directory]
+            if listed_mtime_ns == mtime_ns:
+                return mtime_ns, entries
+        except KeyError:
+            pass
+        with os.scandir(directory) as scan:
+            entries = {entry.name: entry.is_dir(follow_symlinks=False)
+                       for entry in scan}
+        self._listings[directory] = mtime_ns, entries
+        return mtime_ns, entries
+
+    def relpaths(self):
+        """
+        paths of the platerun directories (ending in '(m)apper') relative
+        to the five_plates directory, searched recursively.
+        """
+        found = []
+        pending = [Path()]
+        while pending:
+            relpath = pending.pop()
+            _, entries = self._listing(self.root / relpath)
+            for name, is_dir in entries.items():
+                if not is_dir or name.startswith('.'):
+                    continue
+                if name.endswith('m'):
+                    found.append(relpath / name)
+                pending.append(relpath / name)
+        return sorted(found)
+
+    def plateruns(self):
+        """
+        names of the platerun directories.
+        """
+        return [relpath.name for relpath in self.relpaths()]
+
+    def platerun_dir(self, platerun):
+        """
+        directory of platerun: in the five_plates directory if it is there
+        (one stat), otherwise found by relpaths. The five_plates directory
+        joined with platerun if there is no such directory.
+        """
+        _, entries = self._listing(self.root)
+        if entries.get(platerun):
+            return self.root / platerun
+        for relpath in sorted(self.relpaths(), key=lambda path: len(path.parts)):
+            if relpath.name == platerun:
+                return self.root / relpath
+        return self.root / platerun
+
+    def files(self, platerun):
+        """
+        sorted names of the files and directories in platerun.
+        """
+        _, entries = self._listing(self.platerun_dir(platerun))
+        return sorted(entries)
+
+    def exists(self, file_path):
+        """
+        Whether file_path exists. From the listings for files under the
+        five_plates directory, otherwise from the filesystem.
+        """
+        file_path = Path(file_path)
+        if self.root not in file_path.parents:
+            return file_path.exists()
+        _, entries = self._listing(file_path.parent)
+        return file_path.name in entries
+
+    def resolve(self, platerun, role, find):
+        """
+        Name of the file of platerun with role (e.g., 'platedata'), found by
+        find(names) from the listing. Kept until the directory changes.
+        """
+        mtime_ns, entries = self._listing(self.platerun_dir(platerun))
+        try:
+            resolved_mtime_ns, name = self._resolved[platerun, role]
+            if resolved_mtime_ns == mtime_ns:
+                return name
+        except KeyError:
+            pass
+        name = find(sorted(entries))
+        self._resolved[platerun, role] = mtime_ns, name
+        return name
+
+    def clear(self):
+        self._listings.clear()
+        self._resolved.clear()
+        return None
+
+
+manifest = FivePlatesManifest()
+
+
 def _five_plates_relpaths():
-    tree_ =  os.walk(config.fiveplates_dir)
-    dirs_ = [Path(root_dir) for (root_dir, _, _) in tree_]
-    relpaths = [dir_.relative_to(config.fiveplates_dir) for dir_ in dirs_
-                if dir_.name.endswith('m')]  # only keep in '(m)apper'
-    return relpaths
+    return manifest.relpaths()
 
 def _five_plates_available_plateruns():
     relpaths = _five_plates_relpaths()
@@ -104,21 +262,39 @@ def _five_plates_available_plateruns():
 
 def fiveplates_platerun(platerun):
     """
-    gets directory of platerun in five_plates repo.
+    gets directory of platerun in five_plates repo, from the manifest.
 
     Parameters
     ----------
     platerun : str
         identifier of platerun, e.g. '2020.08.x.mwm-bhm'
     """
-    return config.fiveplates_dir / platerun
+    return manifest.platerun_dir(platerun)
 
 def fp_files(platerun):
     """
     get list of files in a five_plates platerun directory.
     Useful for fuzzyish file finding.
     """
-    return os.listdir(fiveplates_platerun(platerun))
+    return manifest.files(platerun)
+
+
+def fp_exists(file_path):
+    """
+    Whether file_path (e.g. paths.fp_defaultparams(platerun)) exists,
+    from the five_plates manifest.
+    """
+    return manifest.exists(file_path)
+
+
+def _find_platedata(platerun, names):
+    _guess = f'plate_data_{platerun}*.txt'
+    pd_files = [F for F in names if fnmatch.fnmatch(F, _guess)]
+    if len(pd_files) == 0:  # no plate data yet
+        return None
+    if len(pd_files) == 1:
+        return pd_files[0]
+    return list(filter(lambda F: 'initial' in F, pd_files))[0]
 
 
 def fp_platedata(platerun):
@@ -130,14 +306,9 @@ def fp_platedata(platerun):
     platerun : str
         identifier of platerun, e.g. '2020.08.x.mwm-bhm'
     """
-
-    _guess = f'plate_data_{platerun}*.txt'
-
-    pd_file_s = filter(lambda F: fnmatch.fnmatch(F, _guess),
-                       fp_files(platerun))
-
-    pd_files = list(pd_file_s)
-    if len(pd_files) == 0:  # no plate data yet
+    pd_file = manifest.resolve(platerun, 'platedata',
+                               lambda names: _find_platedata(platerun, names))
+    if pd_file is None:  # no plate data yet
         _message = f'''\
                        Unable to load fiveplates plate data file for:
                        {platerun}.
@@ -148,12 +319,7 @@ def fp_platedata(platerun):
                     '''
         print(_message)
         return None
-    else:
-        if len(pd_files) == 1:
-            pd_file = pd_files[0]
-        else:
-            pd_file = list(filter(lambda F: 'initial' in F, pd_files))[0]
-        return fiveplates_platerun(platerun) / pd_file
+    return fiveplates_platerun(platerun) / pd_file
 
 
 def fp_defaultparams(platerun):
@@ -0,0 +1,46 @@
+import numpy as np
+
+from ppv import archive
+
+
+def _write_archive(archive_dir, plates_catalogids):
+    """
+    Writes an archive of plates {platenum: catalogids} to archive_dir.
+    """
+    index = np.zeros(0, dtype=archive.PlugHolesArchive(archive_dir).index.dtype)
+    pieces = {column: [] for column in archive.columns}
+    offset = 0
+    for platenum, catalogids in plates_catalogids.items():
+        N_rows = len(catalogids)
+        plate_columns = {column: np.zeros(N_rows) for column in archive.columns}
+        plate_columns['catalogid'] = np.sort(np.asarray(catalogids, dtype=np.uint64))
+        for column in ['holetype', 'targettype', 'platerun', 'tmass_id',
+                       'firstcarton']:
+            plate_columns[column] = np.full(N_rows, 'x')
+        for column in ['plate', 'designid']:
+            plate_columns[column] = np.full(N_rows, platenum, dtype=np.int64)
+        for column in archive.columns:
+            pieces[column].append(plate_columns[column])
+        index = np.append(index, np.array([(platenum, offset, N_rows, 0, 0)],
+                                          dtype=index.dtype))
+        offset += N_rows
+    archive.PlugHolesArchive(archive_dir)._write(
+        index, {column: np.concatenate(pieces[column])
+                for column in archive.columns})
+
+
+def test_lookup_sees_updated_archive(tmp_path, monkeypatch):
+    archive_dir = tmp_path / 'plugHoles_archive'
+    monkeypatch.setattr(archive.paths, 'plugholes_archive', lambda: archive_dir)
+    monkeypatch.setattr(archive, '_fieldnames',
+                        lambda platenums: np.asarray(platenums).astype('U'))
+    monkeypatch.setattr(archive, '_archive', None)
+
+    _write_archive(archive_dir, {1: [10, 11]})
+    assert archive.lookup([11])['plate'].tolist() == [1]
+
+    # as after update_archive (OR an update by another process)
+    _write_archive(archive_dir, {1: [10, 11], 2: [11, 12]})
+    found = archive.lookup([11, 12])
+    assert found['plate'].tolist() == [1, 2, 2]
+    assert found['catalogid'].tolist() == [11, 11, 12]
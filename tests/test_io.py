@@ -0,0 +1,29 @@
+import io
+
+import numpy as np
+import pytest
+from astropy.table import Table
+
+from ppv.data.io import read_fp_table
+
+
+def test_read_fp_table_masks_empty_fields():
+    text = '# a b c d\n1 "" 2.5 x\n"" "q r" 3 ""\n3 y "" z\n'
+    table = read_fp_table(io.StringIO(text))
+    expected = Table.read(text, format='ascii.commented_header')
+    for name in expected.colnames:
+        assert table[name].dtype == expected[name].dtype
+        assert table[name].mask.tolist() == expected[name].mask.tolist()
+        assert table[name].filled().tolist() == expected[name].filled().tolist()
+
+
+@pytest.mark.parametrize('header, text', [
+    ('commented', '# Catalog_id RA Dec carton\n'),
+    ('basic', 'Catalog_id RA Dec carton\n'),
+])
+def test_read_fp_table_without_rows(header, text):
+    table = read_fp_table(io.StringIO(text), header=header)
+    assert table.colnames == ['Catalog_id', 'RA', 'Dec', 'carton']
+    assert len(table) == 0
+    assert table['Catalog_id'].dtype == np.int64
+    assert table['RA'].dtype == np.float64
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from astropy.table import Table
+
+from ppv import process
+
+
+def _targets():
+    N_targets = 10
+    return Table({'catalogid': np.arange(N_targets),
+                  'RA': np.linspace(10, 10.1, N_targets),
+                  'Dec': np.full(N_targets, 20.),
+                  'instrument': ['boss'] * N_targets,
+                  'Type': np.zeros(N_targets, dtype=int),
+                  'order_priority': np.repeat([1, 2], N_targets // 2)})
+
+
+def test_min_separation_needs_center():
+    with pytest.raises(ValueError, match='center'):
+        process.simulate_platedesign(_targets(), 0, 3, min_separation=10.)
+    with pytest.raises(ValueError, match='center'):
+        process.simulate_platedesign_ensemble(_targets(), 0, 3,
+                                              n_realizations=2,
+                                              min_separation=10.)
+
+
+def test_min_separation_with_center():
+    pytest.importorskip('scipy')
+    assigned = process.simulate_platedesign(_targets(), 0, 3,
+                                            min_separation=10.,
+                                            center=(10.05, 20.))
+    assert len(assigned) == 3